@@ -0,0 +1,221 @@
+# ==========================================
+# Dragon's Dogma – Capture / Replay Archive
+# ==========================================
+# Records every response fetched during a live scrape (list pages, item
+# pages, images) into a tar archive, and replays that archive later with
+# no network so the JSON can be rebuilt deterministically.
+#
+# Archive layout:
+#   responses/<sha1 of url>   raw response body
+#   index.json                url -> member name, status code, headers
+#
+# Plain .tar archives are replayed through a memory map (bodies are sliced
+# straight out of the file). Compressed archives (.tar.gz, .tar.xz, .tar.bz2)
+# are smaller but have to be decompressed through tarfile on replay.
+
+import argparse
+import hashlib
+import io
+import json
+import mmap
+import tarfile
+import time
+
+import requests
+
+from FextralifeWeaponScraper import FextralifeWeaponsListScraper, crawl_weapons
+from FextralifeWeaponScraper import FextralifeWeaponScraper as FextralifeWeaponPageScraper
+from FextralifeArmorListScraper import FextralifeArmorListScraper, crawl_armor
+from FextralifeArmorListScraper import FextralifeWeaponScraper as FextralifeArmorPageScraper
+from FextralifeItemModel import save_records
+from post_scrape import run_post_scrape
+
+INDEX_MEMBER = "index.json"
+
+# Response headers worth keeping; enough for requests to decode .text the same way
+KEPT_HEADERS = ("Content-Type", "Content-Encoding", "Last-Modified", "ETag")
+
+
+def _tar_mode(path, write):
+    """Picks the tarfile mode from the archive file extension."""
+    for ext, comp in ((".gz", "gz"), (".tgz", "gz"), (".xz", "xz"), (".bz2", "bz2")):
+        if path.endswith(ext):
+            return f"{'w' if write else 'r'}:{comp}"
+    return "w" if write else "r:"
+
+
+def _member_name(url):
+    return "responses/" + hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def _is_success(status_code):
+    return 200 <= status_code < 300
+
+
+def _build_response(url, status_code, headers, body):
+    """Builds a real requests.Response from stored parts (works with .text, iter_content, ...)."""
+    r = requests.models.Response()
+    r.url = url
+    r.status_code = status_code
+    r.headers.update(headers)
+    r.encoding = requests.utils.get_encoding_from_headers(r.headers)
+    r._content = body
+    r._content_consumed = True
+    return r
+
+
+class ArchiveRecordingSession:
+    """
+    requests-compatible session that performs live requests and writes every
+    response into a tar archive. Pass it as session= to the scrapers and call
+    close() (or use it as a context manager) to write the index.
+    """
+
+    def __init__(self, archive_path, session=None):
+        self.archive_path = archive_path
+        self.session = session if session is not None else requests.Session()
+        self._tar = tarfile.open(archive_path, _tar_mode(archive_path, write=True))
+        self._index = {}
+
+    def get(self, url, **kwargs):
+        # Always read the full body so it can be archived; callers that asked
+        # for stream=True still get a response whose iter_content() works.
+        kwargs.pop("stream", None)
+        r = self.session.get(url, **kwargs)
+
+        # Keep the first response per URL, unless it failed and a retry succeeded
+        # (otherwise replay would fail every retry of that image again)
+        stored = self._index.get(url)
+        if stored is None or (not _is_success(stored["status"]) and _is_success(r.status_code)):
+            member = _member_name(url)
+            self._add_member(member, r.content)
+            self._index[url] = {
+                "member": member,
+                "status": r.status_code,
+                "headers": {k: r.headers[k] for k in KEPT_HEADERS if k in r.headers},
+            }
+        return r
+
+    def _add_member(self, name, payload):
+        info = tarfile.TarInfo(name)
+        info.size = len(payload)
+        info.mtime = 0  # keep archives byte-identical for identical captures
+        self._tar.addfile(info, io.BytesIO(payload))
+
+    def close(self):
+        if self._tar is None:
+            return
+        index = json.dumps(self._index, indent=1, sort_keys=True).encode("utf-8")
+        self._add_member(INDEX_MEMBER, index)
+        self._tar.close()
+        self._tar = None
+        print(f"Captured {len(self._index)} responses into {self.archive_path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ArchiveReplaySession:
+    """
+    requests-compatible session that answers get() from a captured archive.
+    URLs missing from the archive raise requests.exceptions.ConnectionError,
+    which the scrapers already handle like a failed request.
+    """
+
+    def __init__(self, archive_path):
+        self.archive_path = archive_path
+        self._tar = tarfile.open(archive_path, _tar_mode(archive_path, write=False))
+        # A replaced response is written again under the same name; the last one wins
+        self._members = {m.name: m for m in self._tar.getmembers()}
+
+        self._file = None
+        self._mmap = None
+        if _tar_mode(archive_path, write=False) == "r:":
+            # Uncompressed archive: member data sits contiguously in the file
+            self._file = open(archive_path, "rb")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._index = json.loads(self._read_member(INDEX_MEMBER))
+
+    def _read_member(self, name):
+        member = self._members[name]
+        if self._mmap is not None:
+            return self._mmap[member.offset_data:member.offset_data + member.size]
+        return self._tar.extractfile(member).read()
+
+    def urls(self):
+        return list(self._index)
+
+    def get(self, url, **kwargs):
+        entry = self._index.get(url)
+        if entry is None:
+            raise requests.exceptions.ConnectionError(f"{url} is not in archive {self.archive_path}")
+        body = self._read_member(entry["member"])
+        return _build_response(url, entry["status"], entry["headers"], body)
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = None
+        self._tar.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def crawl_with_session(session, kinds=("weapons", "armor")):
+    """
+    Runs the regular synchronous crawls with every request routed through session.
+    :return: dict of kind -> list of ItemRecord objects
+    """
+    results = {}
+    if "weapons" in kinds:
+        results["weapons"] = crawl_weapons(
+            FextralifeWeaponsListScraper(session=session),
+            FextralifeWeaponPageScraper(download_dir="scraped_weapon_data", session=session),
+        )
+    if "armor" in kinds:
+        results["armor"] = crawl_armor(
+            FextralifeArmorListScraper(session=session),
+            FextralifeArmorPageScraper(download_dir="scraped_armor_images", session=session),
+        )
+    return results
+
+
+OUTPUT_FILES = {"weapons": "all_weapons_data.json", "armor": "all_armor_data.json"}
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Capture a live scrape into an archive, or rebuild the JSON from one.")
+    parser.add_argument("mode", choices=["capture", "replay"])
+    parser.add_argument("archive", help="archive path (.tar for memory-mapped replay, or .tar.gz/.tar.xz/.tar.bz2)")
+    parser.add_argument("--kind", choices=["weapons", "armor", "all"], default="all")
+    args = parser.parse_args()
+
+    kinds = ("weapons", "armor") if args.kind == "all" else (args.kind,)
+    start = time.time()
+
+    if args.mode == "capture":
+        with ArchiveRecordingSession(args.archive) as session:
+            results = crawl_with_session(session, kinds)
+    else:
+        with ArchiveReplaySession(args.archive) as session:
+            results = crawl_with_session(session, kinds)
+
+    for kind, items in results.items():
+        save_records(items, OUTPUT_FILES[kind])
+        print(f"Saved {len(items)} {kind} to {OUTPUT_FILES[kind]}")
+        run_post_scrape(kind, items)
+
+    print(f"{args.mode.capitalize()} finished in {time.time() - start:.1f}s")
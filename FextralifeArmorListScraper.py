@@ -6,10 +6,12 @@ import requests
 from bs4 import BeautifulSoup
 import re
 import os
-import json
 import time
 from urllib.parse import urlparse
 
+from FextralifeItemModel import ItemRecord, save_records
+from post_scrape import run_post_scrape
+
 
 # ============================================================
 # ARMOR LIST SCRAPER (TABLE-BASED, MAIN PAGE IMAGE EXTRACTION)
@@ -27,24 +29,37 @@ class FextralifeArmorListScraper:
         )
     }
 
+    def __init__(self, session=None):
+        # Any object with a requests-compatible get() (Session, archive replay, ...)
+        self.session = session if session is not None else requests
+
     def get_armor_links(self, url=ARMOR_LIST_URL):
         """
         Returns a list of tuples:
-        (armor_name, armor_page_url, main_page_image_url)
+        (armor_name, armor_page_url, main_page_image_url, armor_slot)
+        armor_slot is the list page section the item is listed under
+        ("Head Armor", "Cloaks", ...), or None if it has no title.
         """
 
         try:
-            r = requests.get(url, headers=self.HEADERS)
+            r = self.session.get(url, headers=self.HEADERS)
             r.raise_for_status()
         except requests.exceptions.RequestException as e:
             print(f"Error accessing {url}: {e}")
             return []
 
-        soup = BeautifulSoup(r.text, "html.parser")
+        return self.parse_armor_links(r.text)
+
+    def parse_armor_links(self, html):
+        """
+        Same as get_armor_links, but for already fetched list page HTML.
+        """
+        soup = BeautifulSoup(html, "html.parser")
         results = []
         seen = set()
 
         for tbody in soup.find_all("tbody"):
+            slot = self._table_slot(tbody)
             for tr in tbody.find_all("tr", recursive=False):
                 a = tr.find("a", class_="wiki_link", href=True)
                 if not a:
@@ -73,10 +88,28 @@ class FextralifeArmorListScraper:
                     continue
 
                 seen.add(page_url)
-                results.append((name, page_url, image_url))
+                results.append((name, page_url, image_url, slot))
 
         return results
 
+    def _table_slot(self, tbody):
+        """
+        Returns the title of the list page section a slot table sits in:
+        the tab that shows it, or else the closest heading above it.
+        """
+        table = tbody.find_parent("table") or tbody
+        for parent in table.parents:
+            tab_id = parent.get("id")
+            if tab_id:
+                tab = table.find_previous("a", href="#" + tab_id)
+                if tab and tab.get_text(strip=True):
+                    return " ".join(tab.get_text(" ", strip=True).split())
+
+        heading = table.find_previous(["h2", "h3", "h4"])
+        if heading and heading.get_text(strip=True):
+            return " ".join(heading.get_text(" ", strip=True).split())
+        return None
+
 
 # =================================================================
 # CANT BE BOTHERED TO RENAME SHARED ITEM PARSER (WEAPONS / ARMOR)
@@ -93,8 +126,11 @@ class FextralifeWeaponScraper:
         )
     }
 
-    def __init__(self, download_dir="item_images"):
+    def __init__(self, download_dir="item_images", session=None, download_images=True):
         self.download_dir = download_dir
+        self.session = session if session is not None else requests
+        # When False, image_path only points at images that are already on disk
+        self.download_images = download_images
         os.makedirs(self.download_dir, exist_ok=True)
 
     # ---------------------------
@@ -130,20 +166,23 @@ class FextralifeWeaponScraper:
             return self.BASE_URL + url
         return self.BASE_URL + "/" + url
 
-    def _download_image(self, image_url, item_name):
+    def _local_image_path(self, image_url, item_name):
         parsed = urlparse(image_url)
         _, ext = os.path.splitext(parsed.path)
 
         safe_name = re.sub(r"[^\w\-_.]", "", item_name.replace(" ", "_"))
         filename = f"{safe_name}{ext or '.png'}"
-        path = os.path.join(self.download_dir, filename)
+        return os.path.join(self.download_dir, filename)
+
+    def _download_image(self, image_url, item_name):
+        path = self._local_image_path(image_url, item_name)
 
         if os.path.exists(path):
             return path
 
         for attempt in range(3):
             try:
-                r = requests.get(image_url, stream=True, headers=self.HEADERS, timeout=10)
+                r = self.session.get(image_url, stream=True, headers=self.HEADERS, timeout=10)
                 r.raise_for_status()
                 with open(path, "wb") as f:
                     for chunk in r.iter_content(8192):
@@ -158,15 +197,47 @@ class FextralifeWeaponScraper:
     # PARSE ITEM PAGE (UNCHANGED CORE LOGIC)
     # ============================================================
 
-    def parse_weapon(self, url, main_page_image_url=None):
+    def parse_weapon(self, url, main_page_image_url=None, armor_slot=None):
         try:
-            r = requests.get(url, headers=self.HEADERS)
+            r = self.session.get(url, headers=self.HEADERS)
             r.raise_for_status()
         except requests.exceptions.RequestException as e:
             print(f"Error accessing {url}: {e}")
             return None
 
-        soup = BeautifulSoup(r.text, "html.parser")
+        data, image_urls = self.extract_weapon(r.text, url, main_page_image_url, armor_slot)
+
+        # -------- Image (MAIN PAGE FIRST, then subpage fallback) --------
+        for image_url in image_urls:
+            if self.download_images:
+                data["image_path"] = self._download_image(image_url, data["name"])
+            else:
+                local_path = self._local_image_path(image_url, data["name"])
+                data["image_path"] = local_path if os.path.exists(local_path) else None
+            if data["image_path"]:
+                break
+
+        return ItemRecord.from_dict(data)
+
+    # ============================================================
+    # EXTRACT ITEM DATA FROM HTML (NO NETWORK)
+    # ============================================================
+
+    def extract_weapon(self, html, url, main_page_image_url=None, armor_slot=None):
+        """
+        Returns a tuple (data, image_urls); image_urls are absolute
+        candidates to download, in order of preference.
+        armor_slot (from the list page) is stored as the "Armor Type" stat
+        when the item page does not give one.
+        """
+        soup = BeautifulSoup(html, "html.parser")
+        try:
+            return self._extract_from_soup(soup, url, main_page_image_url, armor_slot)
+        finally:
+            # Free the parse tree now rather than when the cyclic GC gets to it
+            soup.decompose()
+
+    def _extract_from_soup(self, soup, url, main_page_image_url=None, armor_slot=None):
         data = {"wiki_link": url}
 
         # -------- Name --------
@@ -180,6 +251,10 @@ class FextralifeWeaponScraper:
         # -------------------------------------------------------
         data["description"] = None
 
+        # Looked up once; the image, locations and stats below reuse them
+        infobox = soup.find("div", id="infobox")
+        headings = soup.find_all(["h2", "h3"])
+
         # 1) Original behavior: 3rd paragraph
         p_tags = soup.find_all("p")
         if len(p_tags) > 2:
@@ -208,26 +283,23 @@ class FextralifeWeaponScraper:
 
         # -------- Image (MAIN PAGE FIRST) --------
         data["image_path"] = None
+        image_urls = []
 
         if main_page_image_url:
-            absolute = self._normalize_image_url(main_page_image_url)
-            data["image_path"] = self._download_image(absolute, data["name"])
+            image_urls.append(self._normalize_image_url(main_page_image_url))
 
         # -------- Fallback to subpage --------
-        if not data["image_path"]:
-            infobox = soup.find("div", id="infobox")
-            if infobox:
-                img = infobox.find("img")
-                if img:
-                    candidate = self._extract_real_image_url(img)
-                    if candidate:
-                        absolute = self._normalize_image_url(candidate)
-                        data["image_path"] = self._download_image(absolute, data["name"])
+        if infobox:
+            img = infobox.find("img")
+            if img:
+                candidate = self._extract_real_image_url(img)
+                if candidate:
+                    image_urls.append(self._normalize_image_url(candidate))
 
       # -------- Locations --------
         data["locations"] = []
 
-        for h in soup.find_all(["h2", "h3"]):
+        for h in headings:
             header_text = h.get_text(strip=True).lower()
 
             if "where to find" in header_text or "location" in header_text:
@@ -262,7 +334,6 @@ class FextralifeWeaponScraper:
             return name
 
         # --- Parse infobox <tr> first ---
-        infobox = soup.find("div", id="infobox")
         if infobox:
             for tr in infobox.find_all("tr"):
                 tds = tr.find_all("td")
@@ -324,7 +395,9 @@ class FextralifeWeaponScraper:
                 elif "Debilitation" in raw_name or "Skill" in raw_name:
                     data["debilitation_res"][clean_name] = val_text
 
-
+        # Most item pages do not name their slot; the list page does
+        if armor_slot and not data["stats"].get("Armor Type"):
+            data["stats"]["Armor Type"] = armor_slot
 
         # -------- Vocations --------
         data["vocations"] = []
@@ -360,31 +433,38 @@ class FextralifeWeaponScraper:
                     data["vocations"].append(vocation)
                     
 
-        return data
+        return data, image_urls
 
 
 # ============================================================
 # MAIN
 # ============================================================
 
-if __name__ == "__main__":
-    list_scraper = FextralifeArmorListScraper()
+def crawl_armor(list_scraper, scraper):
     print("Fetching armor links...")
     armor_links = list_scraper.get_armor_links()
     print(f"Found {len(armor_links)} armor pages\n")
 
-    scraper = FextralifeWeaponScraper(download_dir="scraped_armor_images")
     all_armor = []
 
-    for i, (name, url, img_url) in enumerate(armor_links, 1):
+    for i, (name, url, img_url, slot) in enumerate(armor_links, 1):
         print(f"[{i}/{len(armor_links)}] Parsing {name}")
-        data = scraper.parse_weapon(url, main_page_image_url=img_url)
+        data = scraper.parse_weapon(url, main_page_image_url=img_url, armor_slot=slot)
         if data:
-            data["id"] = i
+            data.id = i
             all_armor.append(data)
 
-    with open("all_armor_data.json", "w", encoding="utf-8") as f:
-        json.dump(all_armor, f, indent=2, ensure_ascii=False)
+    return all_armor
+
+
+if __name__ == "__main__":
+    list_scraper = FextralifeArmorListScraper()
+    scraper = FextralifeWeaponScraper(download_dir="scraped_armor_images")
+    all_armor = crawl_armor(list_scraper, scraper)
+
+    save_records(all_armor, "all_armor_data.json")
 
     print("\n✔ Armor scrape complete")
     print(f"✔ Saved {len(all_armor)} armor items")
+
+    run_post_scrape("armor", all_armor)
@@ -0,0 +1,353 @@
+# ==========================================
+# Dragon's Dogma – Async Crawler (Fextralife)
+# ==========================================
+# Asynchronous alternative to the two __main__ blocks.
+# One aiohttp session, a semaphore bounding in-flight page/image requests,
+# an optional byte budget bounding the page HTML held in memory at once,
+# and the exact same extraction code as the synchronous scrapers.
+
+import argparse
+import asyncio
+import os
+
+import aiohttp
+
+from FextralifeWeaponScraper import (
+    FextralifeWeaponsListScraper,
+    FextralifeWeaponScraper,
+    WEAPON_LIST_OFFSET,
+)
+from FextralifeArmorListScraper import FextralifeArmorListScraper
+from FextralifeArmorListScraper import FextralifeWeaponScraper as FextralifeArmorScraper
+from FextralifeItemModel import ItemRecord, save_records
+from memory_report import MemoryReport
+from post_scrape import run_post_scrape
+
+
+class ByteBudget:
+    """
+    Async counting budget in bytes. Page fetches reserve their size before the
+    request is sent and release it once the page is extracted, so the HTML
+    (and the parse trees built from it) held at any moment stays near the limit.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self, n):
+        # A single page larger than the whole budget still gets through on its own
+        n = min(n, self.limit)
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.used + n <= self.limit)
+            self.used += n
+        return n
+
+    async def release(self, n):
+        async with self._cond:
+            self.used -= n
+            self._cond.notify_all()
+
+
+class _OverBudget(Exception):
+    """A page body grew past its reservation while being read."""
+
+    def __init__(self, size):
+        super().__init__(size)
+        self.size = size
+
+
+class FextralifeAsyncCrawler:
+    """
+    Crawls the weapons or armor list and every item page concurrently.
+    Page parsing is delegated to extract_weapon of the matching synchronous
+    scraper, so records are identical to the ones parse_weapon produces.
+    """
+
+    KINDS = {
+        "weapons": {
+            "download_dir": "scraped_weapon_data",
+            "output_file": "all_weapons_data.json",
+        },
+        "armor": {
+            "download_dir": "scraped_armor_images",
+            "output_file": "all_armor_data.json",
+        },
+    }
+
+    # First reservation per page; raised to the largest page seen so far
+    PAGE_SIZE_ESTIMATE = 256 * 1024
+
+    # Content-Length of a gzip/deflate body is the compressed size; HTML
+    # usually decodes to several times that
+    COMPRESSION_RATIO = 8
+
+    # Page bodies are read (decoded) in chunks of this size and counted as they arrive
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, kind="weapons", max_concurrency=50, timeout=30, memory_budget=None):
+        """
+        :param kind: "weapons" or "armor".
+        :param max_concurrency: Maximum number of page and image requests in flight.
+        :param timeout: Total timeout in seconds for a single request.
+        :param memory_budget: Optional maximum bytes of page HTML being read or
+                              parsed at once (None for no limit).
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown kind {kind!r}, expected one of {sorted(self.KINDS)}")
+
+        self.kind = kind
+        self.max_concurrency = max_concurrency
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.memory_budget = memory_budget
+
+        download_dir = self.KINDS[kind]["download_dir"]
+        if kind == "weapons":
+            self.list_scraper = FextralifeWeaponsListScraper()
+            self.scraper = FextralifeWeaponScraper(download_dir=download_dir)
+        else:
+            self.list_scraper = FextralifeArmorListScraper()
+            self.scraper = FextralifeArmorScraper(download_dir=download_dir)
+
+        # Created inside run() so they bind to the running event loop
+        self._session = None
+        self._semaphore = None
+        self._budget = None
+        self._page_estimate = self.PAGE_SIZE_ESTIMATE
+
+    # ---------------------------
+    # Network helpers
+    # ---------------------------
+
+    async def _fetch_text(self, url):
+        async with self._semaphore:
+            try:
+                async with self._session.get(url) as r:
+                    r.raise_for_status()
+                    return await r.text()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"Error accessing {url}: {e}")
+                return None
+
+    async def _fetch_page(self, url):
+        """
+        Like _fetch_text, but within the byte budget.
+
+        The budget is reserved before the request is sent (and before taking
+        a connection slot), so waiting for it never counts against the request
+        timeout. The decoded body is counted chunk by chunk against the
+        reservation; a page that outgrows it is dropped and fetched again once
+        a reservation of its size is available. A task never waits for budget
+        while holding any, so waiting tasks cannot deadlock.
+
+        :return: (html, reserved_bytes) or None; release reserved_bytes when done with html.
+        """
+        need = self._page_estimate
+        while True:
+            reserved = await self._budget.acquire(need)
+            # Holding the whole budget means running alone: nothing to wait for
+            allowed = reserved if self.memory_budget and reserved < self._budget.limit else None
+            try:
+                html = await self._read_page(url, allowed)
+            except _OverBudget as e:
+                await self._budget.release(reserved)
+                # Later pages start from what this one needed
+                self._page_estimate = max(self._page_estimate, e.size)
+                need = max(e.size, self._page_estimate)
+                print(f"{url} is larger than expected ({need} bytes), fetching it again")
+                continue
+            except BaseException:
+                await self._budget.release(reserved)
+                raise
+
+            if html is None:
+                await self._budget.release(reserved)
+                return None
+            self._page_estimate = max(self._page_estimate, len(html))
+            return html, reserved
+
+    async def _read_page(self, url, allowed):
+        """
+        Reads one page, raising _OverBudget as soon as more than allowed
+        decoded bytes arrive (allowed=None for no limit).
+        :return: The page text, or None if the request failed.
+        """
+        async with self._semaphore:
+            try:
+                async with self._session.get(url) as r:
+                    r.raise_for_status()
+                    body = bytearray()
+                    async for chunk in r.content.iter_chunked(self.CHUNK_SIZE):
+                        body += chunk
+                        if allowed is not None and len(body) > allowed:
+                            raise _OverBudget(self._expected_size(r, len(body)))
+                    return body.decode(r.charset or "utf-8", errors="replace")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"Error accessing {url}: {e}")
+                return None
+
+    def _expected_size(self, r, read):
+        """Best guess of a page's decoded size after read bytes of it came in."""
+        size = r.content_length
+        if size is not None and r.headers.get("Content-Encoding", "identity").lower() == "identity":
+            return max(size, read)
+        if size is not None:
+            # Compressed: Content-Length is the compressed size
+            return max(read * 2, size * self.COMPRESSION_RATIO)
+        return read * 2
+
+    async def _download_image(self, image_url, item_name):
+        """
+        Async counterpart of _download_image: same filename, same retry/backoff,
+        with the file write handed to a worker thread so the loop never blocks on disk.
+        """
+        path = self.scraper._local_image_path(image_url, item_name)
+        loop = asyncio.get_running_loop()
+
+        # The armor scraper never re-downloads an existing image
+        if self.kind == "armor" and os.path.exists(path):
+            return path
+
+        max_retries = 3
+        retry_delay = 2
+        for attempt in range(max_retries):
+            try:
+                async with self._semaphore:
+                    async with self._session.get(image_url) as r:
+                        r.raise_for_status()
+                        content = await r.read()
+                await loop.run_in_executor(None, _write_file, path, content)
+                return path
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(retry_delay)
+                    retry_delay *= 2
+                else:
+                    print(f"Failed to download image for {item_name} after {max_retries} attempts: {e}")
+        return None
+
+    # ---------------------------
+    # Crawl
+    # ---------------------------
+
+    async def _get_links(self):
+        """Returns (name, url, main_page_image_url, armor_slot) tuples for the configured kind."""
+        if self.kind == "weapons":
+            html = await self._fetch_text(self.list_scraper.WEAPONS_LIST_URL)
+            if html is None:
+                return []
+            links = self.list_scraper.parse_weapon_links(html)[WEAPON_LIST_OFFSET:]
+            return [(name, url, None, None) for name, url in links]
+
+        html = await self._fetch_text(self.list_scraper.ARMOR_LIST_URL)
+        if html is None:
+            return []
+        return self.list_scraper.parse_armor_links(html)
+
+    async def _parse_item(self, name, url, main_page_image_url, armor_slot):
+        page = await self._fetch_page(url)
+        if page is None:
+            return None
+        html, reserved = page
+
+        # BeautifulSoup parsing is CPU-bound; keep it off the event loop
+        loop = asyncio.get_running_loop()
+        try:
+            if self.kind == "weapons":
+                data, image_urls = await loop.run_in_executor(
+                    None, self.scraper.extract_weapon, html, url
+                )
+            else:
+                data, image_urls = await loop.run_in_executor(
+                    None, self.scraper.extract_weapon, html, url, main_page_image_url, armor_slot
+                )
+        finally:
+            # The parse tree is already decomposed; drop the HTML before giving back its budget
+            html = page = None
+            await self._budget.release(reserved)
+
+        for image_url in image_urls:
+            data["image_path"] = await self._download_image(image_url, data["name"])
+            if data["image_path"]:
+                break
+        if self.kind == "weapons" and not image_urls:
+            print(f"Warning: No image found for {data.get('name', 'Unknown')} (url: {url})")
+
+        print(f"Parsed {name}")
+        return ItemRecord.from_dict(data)
+
+    async def run(self):
+        """
+        Crawls every item of the configured kind.
+        :return: List of ItemRecord objects, in list page order.
+        """
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._budget = ByteBudget(self.memory_budget or float("inf"))
+        self._page_estimate = self.PAGE_SIZE_ESTIMATE
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+        async with aiohttp.ClientSession(
+            headers=self.scraper.HEADERS, timeout=self.timeout, connector=connector
+        ) as session:
+            self._session = session
+            try:
+                links = await self._get_links()
+                print(f"Found {len(links)} {self.kind} pages\n")
+                results = await asyncio.gather(
+                    *(self._parse_item(*link) for link in links)
+                )
+            finally:
+                self._session = None
+
+        # IDs follow list position (failed pages leave a gap), same as the sync scrapers
+        items = []
+        for i, record in enumerate(results, 1):
+            if record:
+                record.id = i
+                items.append(record)
+        return items
+
+
+def _write_file(path, content):
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crawl Fextralife weapons or armor asynchronously.")
+    parser.add_argument("kind", choices=sorted(FextralifeAsyncCrawler.KINDS))
+    parser.add_argument("--concurrency", type=int, default=50,
+                        help="maximum number of requests in flight (default: 50)")
+    parser.add_argument("--output", help="output JSON file (defaults to the sync scraper's file)")
+    parser.add_argument("--memory-budget", type=float, metavar="MB",
+                        help="maximum MB of page HTML read or parsed at once")
+    parser.add_argument("--memory-report", action="store_true",
+                        help="print tracemalloc current/peak memory per stage")
+    args = parser.parse_args()
+
+    report = MemoryReport()
+    if args.memory_report:
+        report.start()
+
+    budget = int(args.memory_budget * 1024 * 1024) if args.memory_budget else None
+    crawler = FextralifeAsyncCrawler(args.kind, max_concurrency=args.concurrency, memory_budget=budget)
+    items = asyncio.run(crawler.run())
+    report.stage("crawl")
+
+    output_file = args.output or FextralifeAsyncCrawler.KINDS[args.kind]["output_file"]
+    save_records(items, output_file)
+    report.stage("write")
+
+    print(f"\n--- Scrape Complete ---")
+    print(f"Saved {len(items)} {args.kind} to {output_file}")
+
+    run_post_scrape(args.kind, items, output_file)
+    report.stage("post_scrape")
+
+    if args.memory_report:
+        print(report.format())
+        report.stop()
@@ -0,0 +1,204 @@
+# ==========================================
+# Dragon's Dogma – Item Record Model
+# ==========================================
+# Compact, typed representation of one scraped item (weapon or armor).
+#
+# parse_weapon returns ItemRecord objects instead of loose dicts:
+#   - slotted dataclasses (no per-instance __dict__)
+#   - stat keys and vocation names are interned, so the few dozen distinct
+#     strings are shared across the whole catalog
+#   - resistances are fixed-position tuples (Fire/Ice/Lightning/Holy/Dark and
+#     the eight debilitations) plus a small tuple for anything non-standard
+#
+# to_dict() / dump_records() produce the same JSON layout as before.
+
+import json
+import os
+import stat
+import sys
+import tempfile
+from dataclasses import dataclass
+
+ELEMENTS = ("Fire", "Ice", "Lightning", "Holy", "Dark")
+
+DEBILITATIONS = (
+    "Poison", "Torpor", "Blindness", "Silence",
+    "Sleep", "Stifling", "Curse", "Petrification",
+)
+
+# Key order of a record in the JSON output
+RECORD_KEYS = (
+    "wiki_link", "name", "description", "image_path", "locations",
+    "stats", "elemental_res", "debilitation_res", "vocations", "id",
+)
+
+
+@dataclass
+class Resistances:
+    """
+    Resistance values at fixed positions given by KEYS. Keys outside KEYS
+    (e.g. "Possession", "Lowered-Defense") are kept in extra, in page order.
+    """
+    __slots__ = ("values", "extra")
+
+    KEYS = ()
+
+    values: tuple
+    extra: tuple
+
+    @classmethod
+    def from_dict(cls, res):
+        positions = cls._positions()
+        values = [None] * len(cls.KEYS)
+        extra = []
+        for key, value in res.items():
+            pos = positions.get(key.lower())
+            if pos is None:
+                extra.append((sys.intern(key), value))
+            else:
+                values[pos] = value
+        return cls(tuple(values), tuple(extra))
+
+    @classmethod
+    def _positions(cls):
+        # Wiki icons are not consistently capitalized ("lightning" vs "Lightning")
+        return {key.lower(): i for i, key in enumerate(cls.KEYS)}
+
+    def __getitem__(self, key):
+        pos = self._positions().get(key.lower())
+        if pos is not None:
+            return self.values[pos]
+        for extra_key, value in self.extra:
+            if extra_key == key:
+                return value
+        raise KeyError(key)
+
+    def to_dict(self):
+        """Standard keys first (canonical order and spelling), then the extra keys."""
+        res = {key: value for key, value in zip(self.KEYS, self.values) if value is not None}
+        res.update(self.extra)
+        return res
+
+
+@dataclass
+class ElementalResistances(Resistances):
+    __slots__ = ()
+    KEYS = ELEMENTS
+
+
+@dataclass
+class DebilitationResistances(Resistances):
+    __slots__ = ()
+    KEYS = DEBILITATIONS
+
+
+@dataclass
+class ItemRecord:
+    """
+    One scraped weapon or armor item.
+    elemental_res / debilitation_res are None for weapons (the weapon
+    parser does not collect them), which keeps them out of the JSON.
+    """
+    __slots__ = RECORD_KEYS
+
+    wiki_link: str
+    name: str
+    description: object    # str or None
+    image_path: object     # str or None
+    locations: tuple
+    stats: tuple           # ((interned key, value), ...) in page order
+    elemental_res: object  # ElementalResistances or None
+    debilitation_res: object  # DebilitationResistances or None
+    vocations: tuple
+    id: object             # int, or None until the crawl assigns it
+
+    @classmethod
+    def from_dict(cls, data):
+        elemental = data.get("elemental_res")
+        debilitation = data.get("debilitation_res")
+        return cls(
+            wiki_link=data["wiki_link"],
+            name=data.get("name"),
+            description=data.get("description"),
+            image_path=data.get("image_path"),
+            locations=tuple(data.get("locations", ())),
+            stats=tuple((sys.intern(k), v) for k, v in data.get("stats", {}).items()),
+            elemental_res=None if elemental is None else ElementalResistances.from_dict(elemental),
+            debilitation_res=None if debilitation is None else DebilitationResistances.from_dict(debilitation),
+            vocations=tuple(sys.intern(v) for v in data.get("vocations", ())),
+            id=data.get("id"),
+        )
+
+    def stat(self, key, default=None):
+        for stat_key, value in self.stats:
+            if stat_key == key:
+                return value
+        return default
+
+    def to_dict(self):
+        """Returns the record in the JSON layout written by the scrapers."""
+        data = {
+            "wiki_link": self.wiki_link,
+            "name": self.name,
+            "description": self.description,
+            "image_path": self.image_path,
+            "locations": list(self.locations),
+            "stats": dict(self.stats),
+        }
+        if self.elemental_res is not None:
+            data["elemental_res"] = self.elemental_res.to_dict()
+        if self.debilitation_res is not None:
+            data["debilitation_res"] = self.debilitation_res.to_dict()
+        data["vocations"] = list(self.vocations)
+        if self.id is not None:
+            data["id"] = self.id
+        return data
+
+
+def load_records(path):
+    """Loads a scraper JSON file into a list of ItemRecord."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [ItemRecord.from_dict(item) for item in json.load(f)]
+
+
+def dump_records(records, f):
+    """Writes records to an open text file in the scrapers' JSON format."""
+    json.dump([record.to_dict() for record in records], f, indent=2, ensure_ascii=False)
+
+
+def atomic_write(path, write):
+    """
+    Calls write(f) on a temporary text file next to path, then swaps it in
+    with os.replace. Readers that keep the file open or memory-mapped
+    (LazyItemLoader) keep seeing the old, complete file instead of a
+    truncated one. The file keeps the permissions of the one it replaces.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            write(f)
+        # mkstemp creates the file 0600; use what open(path, "w") would have given
+        os.chmod(tmp_path, _file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _file_mode(path):
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def save_json(data, path):
+    """Atomically writes data to path as indented JSON (the scrapers' format)."""
+    atomic_write(path, lambda f: json.dump(data, f, indent=2, ensure_ascii=False))
+
+
+def save_records(records, path):
+    """Atomically writes records to path in the scrapers' JSON format."""
+    save_json([record.to_dict() for record in records], path)
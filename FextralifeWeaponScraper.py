@@ -8,10 +8,16 @@ import requests
 from bs4 import BeautifulSoup
 import re
 import os
-import json
 import time
 from urllib.parse import urlparse
 
+from FextralifeItemModel import ItemRecord, save_records
+from post_scrape import run_post_scrape
+
+# The first 46 links on the weapons list page are navigation/category links,
+# not individual weapons ("magic number 46 list pre-splice")
+WEAPON_LIST_OFFSET = 46
+
 class FextralifeWeaponsListScraper:
     """
     A class to scrape the weapons list page and extract links to individual weapons.
@@ -30,9 +36,15 @@ class FextralifeWeaponsListScraper:
         "Accept-Language": "en-US,en;q=0.9",
     }
 
-    def __init__(self):
-        """Initializes the weapons list scraper. (NOT NEEDED CURRENTLY)"""
-        pass
+    def __init__(self, session=None):
+        """
+        Initializes the weapons list scraper.
+        
+        :param session: Optional object with a requests-compatible get() method
+                        (e.g. a requests.Session or an archive replay session).
+                        Defaults to the requests module itself.
+        """
+        self.session = session if session is not None else requests
 
     def get_weapon_links(self, url=WEAPONS_LIST_URL):
         """
@@ -44,14 +56,22 @@ class FextralifeWeaponsListScraper:
         """
     
         try:
-            r = requests.get(url, headers=self.HEADERS)
+            r = self.session.get(url, headers=self.HEADERS)
             r.raise_for_status()
         except requests.exceptions.RequestException as e:
             print(f"Error accessing {url}: {e}")
             return []
+
+        return self.parse_weapon_links(r.text)
+
+    def parse_weapon_links(self, html):
+        """
+        Extracts all weapon links from already fetched weapons list page HTML.
         
-        soup = BeautifulSoup(r.text, "html.parser")
-        weapon_links = []
+        :param html: The HTML text of the weapons list page.
+        :return: A list of tuples containing (weapon_name, weapon_url)
+        """
+        soup = BeautifulSoup(html, "html.parser")
 
         # Find a reasonable content container (robust to class name variations)
         content = soup.find("div", class_="page-content") or soup.find("div", class_="content") or soup
@@ -130,11 +150,17 @@ class FextralifeWeaponScraper:
         "Accept-Language": "en-US,en;q=0.9",
     }
 
-    def __init__(self, download_dir="weapon_images"):
+    def __init__(self, download_dir="weapon_images", session=None, download_images=True):
         """
         Initializes the scraper with a specific directory for image downloads.
+        An optional requests-compatible session can be passed to route all
+        page and image requests through it (defaults to the requests module).
+        With download_images=False no images are fetched; image_path then points
+        at an already downloaded copy if one exists, otherwise stays None.
         """
         self.download_dir = download_dir
+        self.session = session if session is not None else requests
+        self.download_images = download_images
         # Ensure the download directory exists upon initialization
         if not os.path.exists(self.download_dir):
             os.makedirs(self.download_dir)
@@ -199,14 +225,11 @@ class FextralifeWeaponScraper:
         # try joining with base
         return self.BASE_URL + "/" + url
 
-    def _download_image(self, image_url, weapon_name):
+    def _local_image_path(self, image_url, weapon_name):
         """
-        Downloads an image from a URL and saves it to the local directory.
-        Includes retry logic with exponential backoff to handle server delays.
-        (Internal method denoted by leading underscore)
+        Builds the local file path an image will be saved to, based on the
+        weapon name and the file extension of the image URL.
         """
-        
-        # 1. Create a safe, unique filename
         # Get the file extension from the URL path
         parsed_url = urlparse(image_url)
         _, file_extension = os.path.splitext(parsed_url.path)
@@ -215,7 +238,17 @@ class FextralifeWeaponScraper:
         safe_name = re.sub(r'[^\w\-_\.]', '', weapon_name.replace(' ', '_'))
         
         filename = f"{safe_name}{file_extension}" if file_extension else f"{safe_name}.img"
-        local_path = os.path.join(self.download_dir, filename)
+        return os.path.join(self.download_dir, filename)
+
+    def _download_image(self, image_url, weapon_name):
+        """
+        Downloads an image from a URL and saves it to the local directory.
+        Includes retry logic with exponential backoff to handle server delays.
+        (Internal method denoted by leading underscore)
+        """
+        
+        # 1. Create a safe, unique filename
+        local_path = self._local_image_path(image_url, weapon_name)
 
         # Retry configuration
         max_retries = 3
@@ -225,7 +258,7 @@ class FextralifeWeaponScraper:
             try:
                 # Use requests to download the image file
                 print(f"Downloading {weapon_name} from {image_url}...")
-                img_data = requests.get(image_url, stream=True, headers=self.HEADERS, timeout=10)
+                img_data = self.session.get(image_url, stream=True, headers=self.HEADERS, timeout=10)
                 img_data.raise_for_status() 
 
                 with open(local_path, 'wb') as handler:
@@ -252,17 +285,52 @@ class FextralifeWeaponScraper:
         and downloads the main weapon image.
         
         :param url: The URL of the Fextralife weapon page.
-        :return: A dictionary containing the scraped weapon data.
+        :return: An ItemRecord containing the scraped weapon data.
         """
         
         try:
-            r = requests.get(url, headers=self.HEADERS)
+            r = self.session.get(url, headers=self.HEADERS)
             r.raise_for_status() # Raise exception for bad status codes
         except requests.exceptions.RequestException as e:
             print(f"Error accessing URL {url}: {e}")
             return None
 
-        soup = BeautifulSoup(r.text, "html.parser")
+        data, image_urls = self.extract_weapon(r.text, url)
+
+        # If we found an image URL, download it
+        if image_urls and not self.download_images:
+            local_path = self._local_image_path(image_urls[0], data["name"])
+            data["image_path"] = local_path if os.path.exists(local_path) else None
+        elif image_urls:
+            data["image_path"] = self._download_image(image_urls[0], data["name"])
+        else:
+            print(f"Warning: No image found for {data.get('name', 'Unknown')} (url: {url})")
+
+        return ItemRecord.from_dict(data)
+
+    def extract_weapon(self, html, url):
+        """
+        Extracts weapon data from already fetched page HTML without touching the network.
+        Shared by parse_weapon and the async crawler so both produce identical records.
+        
+        :param html: The HTML text of the Fextralife weapon page.
+        :param url: The URL the HTML was fetched from (stored as wiki_link).
+        :return: A tuple (data, image_urls) where image_urls lists absolute image
+                 URLs to try downloading, in order of preference.
+        """
+        soup = BeautifulSoup(html, "html.parser")
+        try:
+            return self._extract_from_soup(soup, url)
+        finally:
+            # Break the tree's parent/child reference cycles right away instead of
+            # leaving the whole page for the cyclic garbage collector
+            soup.decompose()
+
+    def _extract_from_soup(self, soup, url):
+        """
+        Does the actual extraction for extract_weapon. Everything stored in data
+        is a plain str copy, so nothing keeps the parse tree alive afterwards.
+        """
         data = {}
         
         # Store the wiki link
@@ -292,9 +360,12 @@ class FextralifeWeaponScraper:
         # -------------------------------------------------------
         data["image_path"] = None
         image_url = None
+
+        # Looked up once; the stats and locations below reuse them
+        infobox = soup.find("div", {"id": "infobox"})
+        headings = soup.find_all(["h2", "h3"])
         
         # Strategy 1: Try infobox
-        infobox = soup.find("div", {"id": "infobox"})
         if infobox:
             img = infobox.find("img")
             if img:
@@ -302,10 +373,15 @@ class FextralifeWeaponScraper:
                 if candidate:
                     image_url = candidate
 
+        # Strategies 2 and 3 both look at every <img> of the page: collect the
+        # tags and their real URLs in one pass instead of one scan per strategy
+        page_images = []
+        if not image_url:
+            page_images = [(img, self._extract_real_image_url(img)) for img in soup.find_all("img")]
+
         # Strategy 2: Try to find any image with 'weapon' or the weapon name in src (preferring real attrs)
         if not image_url:
-            for img in soup.find_all("img"):
-                real = self._extract_real_image_url(img)
+            for img, real in page_images:
                 if not real:
                     continue
                 src = real.lower()
@@ -316,46 +392,37 @@ class FextralifeWeaponScraper:
                     break
         
         # Strategy 3: Find largest image (likely the main weapon image)
-        if not image_url:
-            all_imgs = soup.find_all("img")
-            if all_imgs:
-                # Filter out obvious icons and small images
-                def is_small_candidate(img):
-                    # examine the best-guess URL from lazy attributes
-                    candidate = self._extract_real_image_url(img)
-                    if not candidate:
-                        return True
-                    lower = candidate.lower()
-                    if any(small in lower for small in ["icon", "thumb", "avatar", "logo", "sprite", "badge"]):
-                        return True
-                    return False
-
-                large_imgs = [img for img in all_imgs if not is_small_candidate(img)]
-                if large_imgs:
-                    # choose first of filtered list, but try to pick one with largest filename (heuristic)
-                    chosen = large_imgs[0]
-                    # prefer one with data-srcset or srcset last entry
-                    for img in large_imgs:
-                        if img.get("data-srcset") or img.get("srcset"):
-                            chosen = img
-                            break
-                    candidate = self._extract_real_image_url(chosen)
-                    if candidate:
-                        image_url = candidate
-
-        # If we found an image URL, download it
+        if not image_url and page_images:
+            # Filter out obvious icons and small images
+            def is_small_candidate(candidate):
+                # examine the best-guess URL from lazy attributes
+                if not candidate:
+                    return True
+                lower = candidate.lower()
+                if any(small in lower for small in ["icon", "thumb", "avatar", "logo", "sprite", "badge"]):
+                    return True
+                return False
+
+            large_imgs = [(img, real) for img, real in page_images if not is_small_candidate(real)]
+            if large_imgs:
+                # choose first of filtered list, but try to pick one with largest filename (heuristic)
+                chosen = large_imgs[0]
+                # prefer one with data-srcset or srcset last entry
+                for img, real in large_imgs:
+                    if img.get("data-srcset") or img.get("srcset"):
+                        chosen = (img, real)
+                        break
+                image_url = chosen[1]
+
+        image_urls = []
         if image_url and data["name"]:
-            absolute_url = self._normalize_image_url(image_url)
-            local_storage_path = self._download_image(absolute_url, data["name"])
-            data["image_path"] = local_storage_path
-        else:
-            print(f"Warning: No image found for {data.get('name', 'Unknown')} (url: {url})")
+            image_urls.append(self._normalize_image_url(image_url))
 
         # -------------------------------------------------------
         # 4. Where to Find (Cleaned)
         # -------------------------------------------------------
         data["locations"] = []
-        for h in soup.find_all(["h2", "h3"]):
+        for h in headings:
             if "Where to Find" in h.text:
                 ul = h.find_next("ul")
                 if ul:
@@ -376,7 +443,6 @@ class FextralifeWeaponScraper:
         data["stats"] = {}
         
         # 5a. Stats from the Infobox
-        infobox = soup.find("div", {"id": "infobox"})
         if infobox:
             for tr in infobox.find_all("tr"):
                 cells = tr.find_all("td")
@@ -417,37 +483,50 @@ class FextralifeWeaponScraper:
                         if clean_vocation not in data["vocations"]:
                             data["vocations"].append(clean_vocation)
                             
-        return data
+        return data, image_urls
 
-if __name__ == "__main__":
-    # 1. Instantiate the weapons list scraper
-    list_scraper = FextralifeWeaponsListScraper()
+def crawl_weapons(list_scraper, scraper):
+    """
+    Fetches the weapons list and parses every weapon page.
     
-    # 2. Get all weapon links from the weapons list page
+    :param list_scraper: A FextralifeWeaponsListScraper instance.
+    :param scraper: A FextralifeWeaponScraper instance.
+    :return: A list of ItemRecord objects, each with an id.
+    """
+    # 1. Get all weapon links from the weapons list page
     print("Fetching weapon links from the weapons list page...")
     weapon_links = list_scraper.get_weapon_links()
     print(f"Found {len(weapon_links)} possible weapons!\n")
     
-    # 3. Instantiate the weapon parser
-    scraper = FextralifeWeaponScraper(download_dir="scraped_weapon_data")
-    
-    # 4. Parse each weapon with magic number 46 list pre-splice
+    # 2. Parse each weapon with magic number 46 list pre-splice
     all_weapons_data = []
-    for i, (weapon_name, weapon_url) in enumerate(weapon_links[46:], 1):
-        print(f"[{i}/{len(weapon_links[46:])}] Parsing {weapon_name}...")
+    for i, (weapon_name, weapon_url) in enumerate(weapon_links[WEAPON_LIST_OFFSET:], 1):
+        print(f"[{i}/{len(weapon_links[WEAPON_LIST_OFFSET:])}] Parsing {weapon_name}...")
         weapon_data = scraper.parse_weapon(weapon_url)
         if weapon_data:
             # Add an ID to each weapon
-            weapon_data["id"] = i
+            weapon_data.id = i
             all_weapons_data.append(weapon_data)
     
     print(f"\n--- Scrape Complete ---")
     print(f"Successfully parsed {len(all_weapons_data)} weapons")
+    return all_weapons_data
+
+
+if __name__ == "__main__":
+    # 1. Instantiate the weapons list scraper and the weapon parser
+    list_scraper = FextralifeWeaponsListScraper()
+    scraper = FextralifeWeaponScraper(download_dir="scraped_weapon_data")
+    
+    # 2. Fetch the list and parse every weapon
+    all_weapons_data = crawl_weapons(list_scraper, scraper)
     
-    # 5. Save all weapon data to a JSON file
+    # 3. Save all weapon data to a JSON file
     output_file = "all_weapons_data.json"
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(all_weapons_data, f, indent=2, ensure_ascii=False)
+    save_records(all_weapons_data, output_file)
     
     print(f"\nWeapon data saved to {output_file}")
-    print(f"Total weapons in JSON: {len(all_weapons_data)}")
\ No newline at end of file
+    print(f"Total weapons in JSON: {len(all_weapons_data)}")
+    
+    # 4. Update the search index and aggregate tables for the new weapon data
+    run_post_scrape("weapons", all_weapons_data)
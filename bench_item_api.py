@@ -0,0 +1,114 @@
+"""
+Load test for item_api_server.py.
+
+Starts the server in-process (or targets --url), then hammers a few
+representative endpoints over keep-alive connections and prints
+requests/sec per scenario. The server is a single Python process, so the
+numbers are effectively single-core throughput.
+
+"cached" scenarios repeat one path, so after the first request they measure
+response cache hits. "uncached" scenarios put a request counter ({i}) into
+the query string, so every request misses the cache and is rendered.
+
+Usage:
+    python bench_item_api.py
+    python bench_item_api.py --requests 5000 --clients 8
+    python bench_item_api.py --url http://127.0.0.1:8000
+"""
+
+import argparse
+import http.client
+import threading
+import time
+from urllib.parse import urlsplit
+
+from item_api_server import make_server
+
+SCENARIOS = [
+    ("item by name, cached", "/armor/Apollo%20Mask", {}),
+    ("item by id, cached", "/weapons/12", {}),
+    ("filtered list, cached", "/armor?vocation=Mystic%20Knight&limit=20", {}),
+    ("filtered list, cached, gzip", "/armor?vocation=Mystic%20Knight&limit=20", {"Accept-Encoding": "gzip"}),
+    ("search, cached", "/search?q=black+cat+mountebank", {}),
+    ("image, cached", "/images/armor/Apollo_Mask.png", {}),
+    # Unused query parameters make every path unique, so each request is rendered
+    ("item by id, uncached", "/weapons/{id}?n={i}", {}),
+    ("filtered list, uncached", "/armor?vocation=Mystic%20Knight&limit=20&offset={offset}&n={i}", {}),
+    ("search, uncached", "/search?q=black+cat+mountebank&n={i}", {}),
+]
+
+
+def _path(template, i):
+    return template.format(i=i, id=i % 200 + 1, offset=i % 50)
+
+
+def _client(host, port, path, headers, count, results, index):
+    conn = http.client.HTTPConnection(host, port)
+    ok = 0
+    for n in range(index * count, (index + 1) * count):
+        conn.request("GET", _path(path, n), headers=headers)
+        r = conn.getresponse()
+        r.read()
+        if r.status in (200, 304):
+            ok += 1
+    conn.close()
+    results[index] = ok
+
+
+def run_scenario(host, port, path, headers, total, clients):
+    """:return: (requests_per_second, successful_requests)"""
+    per_client = total // clients
+    results = [0] * clients
+    threads = [
+        threading.Thread(target=_client, args=(host, port, path, headers, per_client, results, i))
+        for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return per_client * clients / elapsed, sum(results)
+
+
+def etag_for(host, port, path):
+    conn = http.client.HTTPConnection(host, port)
+    conn.request("GET", path)
+    r = conn.getresponse()
+    r.read()
+    conn.close()
+    return r.getheader("ETag")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the item API server.")
+    parser.add_argument("--url", help="benchmark an already running server instead of starting one")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per scenario (default: 2000)")
+    parser.add_argument("--clients", type=int, default=4, help="concurrent keep-alive connections (default: 4)")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        server = make_server("127.0.0.1", 0, quiet=True)
+        host, port = server.server_address
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    scenarios = list(SCENARIOS)
+    etag = etag_for(host, port, SCENARIOS[0][1])
+    if etag:
+        scenarios.insert(6, ("item revalidation (304)", SCENARIOS[0][1], {"If-None-Match": etag}))
+
+    print(f"{args.requests} requests per scenario, {args.clients} clients, server http://{host}:{port}\n")
+    for name, path, headers in scenarios:
+        rps, ok = run_scenario(host, port, path, headers, args.requests, args.clients)
+        print(f"{name:30s} {rps:9.0f} req/s  ({ok} ok)")
+
+    if server is not None:
+        cache = server.RequestHandlerClass.api.cache
+        print(f"\nResponse cache: {cache.hits} hits, {cache.misses} misses")
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,251 @@
+"""
+Precomputed aggregate tables over both datasets.
+
+Answers questions like "best fire resistance per armor slot for Mystic Knight"
+or "heaviest weapon each vocation can use" without scanning every record and
+re-parsing "15%," style strings each time.
+
+Numeric columns (resistances, weights, stats) are parsed once into float
+arrays, then for every (vocation, armor slot / weapon type, element, column)
+group the table stores min, max, count and the top-k items sorted best first.
+Weapons are grouped by their "Elemental" stat ("None" for plain weapons);
+armor has no element of its own, its element resistances are columns. "All"
+is used as a wildcard for vocation, type and element.
+
+The tables are saved to all_item_aggregates.json together with a fingerprint
+of the source items (scrape_diff item hashes), and are only rebuilt when the
+items actually change.
+
+Usage:
+    python item_aggregates.py            # rebuild if the data changed
+    python item_aggregates.py --force
+    python item_aggregates.py top armor "Mystic Knight" "Head Armor" Fire
+    python item_aggregates.py top weapons Fighter All Weight
+    python item_aggregates.py top weapons Fighter All Strength --element Fire
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from array import array
+from collections import defaultdict
+
+from FextralifeItemModel import DEBILITATIONS, ELEMENTS
+from scrape_diff import build_hash_index
+
+AGGREGATES_FILE = "all_item_aggregates.json"
+
+# Bumped whenever the table layout changes, so old files are rebuilt
+FORMAT_VERSION = 2
+
+DATASETS = {"weapons": "all_weapons_data.json", "armor": "all_armor_data.json"}
+
+ALL = "All"
+TOP_K = 10
+
+# Numeric stat columns per kind, besides the resistances
+STAT_COLUMNS = {
+    "armor": ("Weight", "Defense", "Magick Defense"),
+    "weapons": ("Weight", "Strength", "Magick", "Stagger Power", "Knockdown Power"),
+}
+
+# Group key per kind: which stat names the item's type/slot
+TYPE_STAT = {"armor": "Armor Type", "weapons": "Weapon Type"}
+
+# Group key per kind: which stat names the item's element
+ELEMENT_STAT = {"weapons": "Elemental"}
+NO_ELEMENT = "None"
+
+_NUMBER_RE = re.compile(r"-?\d[\d,]*\.?\d*|-?\.\d+")
+
+# "ElementalResist (icon-element-fire)", "DebilitationResist (icon-debilitation-skill-stifling)"
+_ICON_STAT_RE = re.compile(r"\(icon-(?:element|debilitation)-(?:skill-)?([a-z]+)\)", re.I)
+
+
+def parse_number(value):
+    """Parses wiki stat strings ("15%,", "-3%", ".17", "238,550G") into floats; None if not numeric."""
+    if not isinstance(value, str):
+        return None
+    m = _NUMBER_RE.search(value)
+    if not m:
+        return None
+    try:
+        return float(m.group().replace(",", ""))
+    except ValueError:
+        return None
+
+
+def _columns(kind):
+    columns = list(STAT_COLUMNS[kind])
+    if kind == "armor":
+        columns += list(ELEMENTS) + list(DEBILITATIONS)
+    return columns
+
+
+def _lookup(item, column):
+    """
+    Finds a column's raw value: stats first, then resistances (case-insensitive),
+    then resistances some pages leave in stats under their icon name.
+    """
+    stats = item.get("stats", {})
+    if column in stats:
+        return stats[column]
+    for section in ("elemental_res", "debilitation_res"):
+        for key, value in item.get(section, {}).items():
+            if key.lower() == column.lower():
+                return value
+    for key, value in stats.items():
+        m = _ICON_STAT_RE.search(key)
+        if m and m.group(1).lower() == column.lower():
+            return value
+    return None
+
+
+def _element(kind, item):
+    """The element group of an item (None for kinds that are not grouped by element)."""
+    if kind not in ELEMENT_STAT:
+        return None
+    value = (item.get("stats", {}).get(ELEMENT_STAT[kind]) or "").strip()
+    for element in ELEMENTS:
+        if value.lower() == element.lower():
+            return element
+    return NO_ELEMENT
+
+
+def build_tables(kind, items):
+    """
+    Builds the aggregate tables for one kind.
+
+    :return: {vocation: {type: {element: {column: {"min", "max", "count", "top"}}}}}
+             where "top" is a list of [value, wiki_link, name], best first.
+    """
+    columns = _columns(kind)
+
+    # Parse every column once into a float array (NaN for missing values)
+    nan = float("nan")
+    parsed = {}
+    for column in columns:
+        values = array("d")
+        for item in items:
+            number = parse_number(_lookup(item, column))
+            values.append(nan if number is None else number)
+        parsed[column] = values
+
+    # Group row numbers by (vocation, type, element), including the "All" wildcards
+    groups = defaultdict(list)
+    for row, item in enumerate(items):
+        item_type = item.get("stats", {}).get(TYPE_STAT[kind]) or "Unknown"
+        element = _element(kind, item)
+        elements = (element, ALL) if element else (ALL,)
+        for vocation in list(item.get("vocations", [])) + [ALL]:
+            for group_type in (item_type, ALL):
+                for group_element in elements:
+                    groups[(vocation, group_type, group_element)].append(row)
+
+    # Heavier is "better" for the weight question; every column sorts high to low
+    tables = defaultdict(lambda: defaultdict(dict))
+    for (vocation, group_type, group_element), rows in groups.items():
+        per_column = {}
+        for column in columns:
+            values = parsed[column]
+            present = [r for r in rows if values[r] == values[r]]  # drop NaN
+            if not present:
+                continue
+            present.sort(key=lambda r: (-values[r], items[r].get("name") or ""))
+            per_column[column] = {
+                "min": values[present[-1]],
+                "max": values[present[0]],
+                "count": len(present),
+                "top": [[values[r], items[r]["wiki_link"], items[r].get("name")] for r in present[:TOP_K]],
+            }
+        tables[vocation][group_type][group_element] = per_column
+    return {vocation: dict(types) for vocation, types in tables.items()}
+
+
+def source_fingerprint(items):
+    """Hash over the items' content (order-independent, formatting-independent)."""
+    index = build_hash_index(items)
+    digest = hashlib.sha1()
+    for link in sorted(index):
+        digest.update(link.encode("utf-8"))
+        digest.update(index[link][0].encode("ascii"))
+    return digest.hexdigest()
+
+
+def load_aggregates(path=AGGREGATES_FILE):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def refresh_aggregates(path=AGGREGATES_FILE, force=False):
+    """
+    Rebuilds the tables of every kind whose source items changed since the
+    last build (or all of them with force=True) and saves the result.
+
+    :return: List of kinds that were rebuilt
+    """
+    aggregates = load_aggregates(path)
+    if not aggregates or aggregates.get("version") != FORMAT_VERSION:
+        aggregates = {"version": FORMAT_VERSION, "sources": {}, "tables": {}}
+    rebuilt = []
+
+    for kind, data_file in DATASETS.items():
+        if not os.path.exists(data_file):
+            continue
+        with open(data_file, "r", encoding="utf-8") as f:
+            items = json.load(f)
+
+        fingerprint = source_fingerprint(items)
+        if not force and aggregates["sources"].get(kind) == fingerprint and kind in aggregates["tables"]:
+            continue
+
+        aggregates["tables"][kind] = build_tables(kind, items)
+        aggregates["sources"][kind] = fingerprint
+        rebuilt.append(kind)
+
+    if rebuilt:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(aggregates, f, indent=1, ensure_ascii=False)
+        print(f"Aggregates rebuilt for {', '.join(rebuilt)} ({path})")
+    else:
+        print(f"Aggregates up to date ({path})")
+    return rebuilt
+
+
+def top(aggregates, kind, vocation, item_type, column, k=TOP_K, element=ALL):
+    """
+    Returns the best items for one table cell, e.g.
+    top(aggregates, "armor", "Mystic Knight", "Head Armor", "Fire") or
+    top(aggregates, "weapons", "Fighter", "Swords", "Strength", element="Holy").
+    """
+    cell = aggregates["tables"].get(kind, {}).get(vocation, {}).get(item_type, {}).get(element, {}).get(column)
+    return cell["top"][:k] if cell else []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or query the precomputed aggregate tables.")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the data did not change")
+    parser.add_argument("--file", default=AGGREGATES_FILE, help=f"aggregates file (default: {AGGREGATES_FILE})")
+    sub = parser.add_subparsers(dest="command")
+    q = sub.add_parser("top", help="show the top items of one table cell")
+    q.add_argument("kind", choices=sorted(DATASETS))
+    q.add_argument("vocation", help=f'vocation name or "{ALL}"')
+    q.add_argument("type", help=f'armor/weapon type, "Unknown" or "{ALL}"')
+    q.add_argument("column", help="e.g. Fire, Poison, Weight, Defense, Strength")
+    q.add_argument("--element", default=ALL,
+                   help=f'weapon element ("Fire", ..., "{NO_ELEMENT}" for plain weapons; default: {ALL})')
+    q.add_argument("-k", type=int, default=TOP_K)
+    args = parser.parse_args()
+
+    refresh_aggregates(args.file, force=args.force)
+
+    if args.command == "top":
+        rows = top(load_aggregates(args.file), args.kind, args.vocation, args.type, args.column, args.k, args.element)
+        if not rows:
+            print("No values for that combination.")
+        for value, link, name in rows:
+            print(f"{value:10g}  {name}  {link}")
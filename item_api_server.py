@@ -0,0 +1,375 @@
+"""
+Small read-only HTTP API over the scraped datasets.
+
+Endpoints:
+    GET /weapons                    list (filters: vocation, type, name, limit, offset)
+    GET /armor                      list (same filters)
+    GET /weapons/<id|name>          one item, e.g. /weapons/12 or /weapons/Dragon's%20Bite
+    GET /armor/<id|name>
+    GET /search?q=black+cat         full-text search over both datasets (kind=, limit=)
+    GET /images/weapons/<file>      images from scraped_weapon_data/
+    GET /images/armor/<file>        images from scraped_armor_images/
+
+Everything is loaded and indexed at startup, and loaded again when a scrape
+rewrites a dataset. Rendered responses are kept in an LRU cache together with
+a gzip-compressed copy and an ETag per variant, so repeated requests are a
+dictionary lookup, and clients holding the ETag get a 304.
+
+Usage:
+    python item_api_server.py --port 8000
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from search_index import DATASETS, SearchIndex
+
+IMAGE_DIRS = {"weapons": "scraped_weapon_data", "armor": "scraped_armor_images"}
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_SIZE = 512
+
+# Seconds between checks whether the dataset files were rewritten
+RELOAD_CHECK_INTERVAL = 1.0
+
+
+class Response:
+    """A fully rendered response: body, optional gzip body and validators."""
+
+    __slots__ = ("status", "content_type", "body", "gzip_body", "etag", "gzip_etag")
+
+    def __init__(self, status, content_type, body, compress=True):
+        self.status = status
+        self.content_type = content_type
+        self.body = body
+        digest = hashlib.sha1(body).hexdigest()[:20]
+        self.etag = f'"{digest}"'
+        # The gzip bytes are a different representation, so they get their own tag
+        self.gzip_etag = f'"{digest}-gz"'
+        self.gzip_body = None
+        if compress and len(body) >= GZIP_MIN_SIZE:
+            # mtime=0 keeps the compressed bytes stable for the same body
+            self.gzip_body = gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison of an If-None-Match header ("*", lists, W/ tags) against etag."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == etag:
+            return True
+    return False
+
+
+def json_response(payload, status=200):
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return Response(status, "application/json; charset=utf-8", body)
+
+
+def error_response(status, message):
+    return json_response({"error": message}, status)
+
+
+class ResponseCache:
+    """Thread-safe LRU of rendered responses keyed by request path + query."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            response = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, key, response):
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _image_file(image_path):
+    # Stored paths come from Windows runs ("scraped_armor_images\\X.png")
+    if not image_path:
+        return None
+    return image_path.replace("\\", "/").rsplit("/", 1)[-1]
+
+
+class ItemStore:
+    """
+    Preloaded datasets with lookup indexes by id, name and wiki_link page name.
+    A given search_index (e.g. the saved one) is brought up to date with the
+    loaded items first. A store is never modified after it is built;
+    is_stale() tells when the files changed and a new store should be built.
+    """
+
+    def __init__(self, datasets=DATASETS, image_dirs=IMAGE_DIRS, search_index=None):
+        self.datasets = datasets
+        self.items = {}
+        self.by_id = {}
+        self.by_name = {}
+        self.by_link = {}
+        self.image_dirs = image_dirs
+        self.sources = _file_versions(datasets)
+
+        for kind, path in datasets.items():
+            with open(path, "r", encoding="utf-8") as f:
+                items = json.load(f)
+            for item in items:
+                image_file = _image_file(item.get("image_path"))
+                item["image_url"] = f"/images/{kind}/{image_file}" if image_file else None
+            self.items[kind] = items
+            self.by_id[kind] = {item["id"]: item for item in items if "id" in item}
+            self.by_link.update((item["wiki_link"], item) for item in items)
+            names = {}
+            for item in items:
+                if item.get("name"):
+                    names.setdefault(item["name"].lower(), item)
+                # Also accept the wiki page name ("Dragon%27s+Bite")
+                page = unquote(item["wiki_link"].rsplit("/", 1)[-1]).replace("+", " ").replace("_", " ")
+                names.setdefault(page.lower(), item)
+            self.by_name[kind] = names
+
+        if search_index is None:
+            search_index = SearchIndex()
+        # A saved index can be older than the datasets; only changed items are reindexed
+        for kind, items in self.items.items():
+            search_index.update_kind(kind, items)
+        self.search_index = search_index
+
+    def is_stale(self):
+        """True if a dataset file was rewritten since this store was loaded."""
+        return _file_versions(self.datasets) != self.sources
+
+    def find(self, kind, key):
+        if key.isdigit() and int(key) in self.by_id[kind]:
+            return self.by_id[kind][int(key)]
+        # "+" stands for a space in wiki page names
+        return self.by_name[kind].get(key.lower()) or self.by_name[kind].get(key.replace("+", " ").lower())
+
+    def filter(self, kind, vocation=None, item_type=None, name=None):
+        type_stat = "Weapon Type" if kind == "weapons" else "Armor Type"
+        results = []
+        for item in self.items[kind]:
+            if vocation and vocation.lower() not in (v.lower() for v in item.get("vocations", [])):
+                continue
+            if item_type and (item.get("stats", {}).get(type_stat) or "").lower() != item_type.lower():
+                continue
+            if name and name.lower() not in (item.get("name") or "").lower():
+                continue
+            results.append(item)
+        return results
+
+
+def _file_versions(datasets):
+    versions = {}
+    for path in datasets.values():
+        try:
+            st = os.stat(path)
+            versions[path] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            versions[path] = None
+    return versions
+
+
+class ItemAPI:
+    """Routes a request path to a rendered Response (no HTTP details here)."""
+
+    def __init__(self, store, cache=None):
+        self.store = store
+        self.cache = cache if cache is not None else ResponseCache()
+        self._reload_lock = threading.Lock()
+        self._checked_at = time.monotonic()
+
+    def handle(self, raw_path):
+        """:return: Response for a GET of raw_path ("/armor?vocation=Fighter")."""
+        self._reload_if_changed()
+        # One consistent pair for this request, even if a reload swaps them meanwhile
+        store, cache = self.store, self.cache
+
+        cached = cache.get(raw_path)
+        if cached is not None:
+            return cached
+
+        response = self._render(store, raw_path)
+        # Only cache successful renders; errors are cheap and unbounded in variety
+        if response.status == 200:
+            cache.put(raw_path, response)
+        return response
+
+    def _reload_if_changed(self):
+        """
+        Rebuilds the store (and starts an empty response cache) when a scrape
+        rewrote a dataset. Checked at most every RELOAD_CHECK_INTERVAL seconds.
+        """
+        now = time.monotonic()
+        if now - self._checked_at < RELOAD_CHECK_INTERVAL:
+            return
+        if not self._reload_lock.acquire(blocking=False):
+            return  # another thread is already checking; serve the current data
+        try:
+            self._checked_at = now
+            if not self.store.is_stale():
+                return
+            try:
+                store = ItemStore(self.store.datasets, self.store.image_dirs, search_index=SearchIndex.load())
+            except (OSError, ValueError) as e:
+                print(f"Could not reload the datasets, still serving the old ones: {e}")
+                return
+            self.store, self.cache = store, ResponseCache(self.cache.max_entries)
+            print("Datasets changed on disk, reloaded")
+        finally:
+            self._reload_lock.release()
+
+    def _render(self, store, raw_path):
+        parts = urlsplit(raw_path)
+        segments = [unquote(s) for s in parts.path.split("/") if s]
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+
+        if not segments:
+            return json_response({"endpoints": ["/weapons", "/armor", "/search?q=", "/images/<kind>/<file>"]})
+
+        head = segments[0]
+        if head in store.items:
+            if len(segments) == 1:
+                return self._list(store, head, query)
+            if len(segments) == 2:
+                item = store.find(head, segments[1])
+                if item is None:
+                    return error_response(404, f"No {head} item {segments[1]!r}")
+                return json_response(item)
+        elif head == "search" and len(segments) == 1:
+            return self._search(store, query)
+        elif head == "images" and len(segments) == 3:
+            return self._image(store, segments[1], segments[2])
+
+        return error_response(404, f"Unknown path {parts.path}")
+
+    def _int_param(self, query, name, default):
+        try:
+            return max(0, int(query.get(name, default)))
+        except ValueError:
+            return default
+
+    def _list(self, store, kind, query):
+        items = store.filter(kind, query.get("vocation"), query.get("type"), query.get("name"))
+        offset = self._int_param(query, "offset", 0)
+        limit = self._int_param(query, "limit", len(items))
+        return json_response({"count": len(items), "items": items[offset:offset + limit]})
+
+    def _search(self, store, query):
+        text = query.get("q", "")
+        kind = query.get("kind")
+        limit = self._int_param(query, "limit", 10)
+        results = []
+        for score, link, doc in store.search_index.search(text, limit=limit, kind=kind):
+            item = store.by_link.get(link)
+            if item is None:
+                continue
+            results.append({"score": round(score, 3), "kind": doc["kind"], "item": item})
+        return json_response({"query": text, "results": results})
+
+    def _image(self, store, kind, filename):
+        directory = store.image_dirs.get(kind)
+        # basename() keeps requests inside the image directory
+        if directory is None or filename != os.path.basename(filename):
+            return error_response(404, "Unknown image")
+        path = os.path.join(directory, filename)
+        if not os.path.isfile(path):
+            return error_response(404, "Unknown image")
+        with open(path, "rb") as f:
+            body = f.read()
+        content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        # PNG/JPEG are already compressed
+        return Response(200, content_type, body, compress=False)
+
+
+class ItemRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 for keep-alive; every response sets Content-Length
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, Nagle plus
+    # delayed ACKs stall every keep-alive response by ~40 ms
+    disable_nagle_algorithm = True
+    api = None  # set by make_server
+    quiet = False
+
+    def do_GET(self):
+        response = self.api.handle(self.path)
+
+        use_gzip = response.gzip_body is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+        body = response.gzip_body if use_gzip else response.body
+        etag = response.gzip_etag if use_gzip else response.etag
+
+        if response.status == 200 and etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            if response.gzip_body is not None:
+                self.send_header("Vary", "Accept-Encoding")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(response.status)
+        self.send_header("Content-Type", response.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        if response.gzip_body is not None:
+            self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(host="127.0.0.1", port=8000, store=None, cache_size=1024, quiet=False):
+    """Builds (but does not start) a ThreadingHTTPServer serving the datasets."""
+    store = store if store is not None else ItemStore(search_index=SearchIndex.load())
+    handler = type("BoundItemRequestHandler", (ItemRequestHandler,), {
+        "api": ItemAPI(store, ResponseCache(cache_size)),
+        "quiet": quiet,
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the scraped weapons and armor over HTTP (read-only).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--cache-size", type=int, default=1024, help="rendered responses kept in the LRU")
+    parser.add_argument("--quiet", action="store_true", help="do not log each request")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, cache_size=args.cache_size, quiet=args.quiet)
+    print(f"Serving items on http://{args.host}:{args.port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
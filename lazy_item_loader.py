@@ -0,0 +1,298 @@
+"""
+Lazy, memory-light access to the generated item JSON files.
+
+Instead of json.load()-ing a whole dataset, LazyItemLoader builds a small
+offset index (name / wiki_link / id -> byte range) once, stores it next to
+the data file, and afterwards decodes only the records that are asked for.
+Decoded records are kept in a small LRU cache.
+
+Works on both the pretty-printed JSON arrays the scrapers write
+(all_weapons_data.json, all_armor_data.json) and on JSONL files
+(one record per line, see write_jsonl).
+
+Usage:
+    python lazy_item_loader.py all_armor_data.json "Apollo Mask"
+    python lazy_item_loader.py all_armor_data.json --to-jsonl all_armor_data.jsonl
+"""
+
+import json
+import mmap
+import os
+import re
+import sys
+from collections import OrderedDict
+
+from FextralifeItemModel import atomic_write
+
+INDEX_SUFFIX = ".idx.json"
+
+# How often opening is retried while the data file keeps changing underneath
+MAX_OPEN_ATTEMPTS = 5
+
+# A JSON string (with escapes) or a single brace. Matching whole strings first
+# means braces inside descriptions/locations never count toward nesting depth.
+_TOKEN_RE = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}]', re.DOTALL)
+
+
+def scan_record_spans(buf):
+    """
+    Finds the byte range of every top-level object in buf.
+    Array brackets are ignored, so this works for a JSON array of objects
+    as well as for JSONL.
+
+    :return: List of (start, end) tuples, end exclusive
+    """
+    spans = []
+    depth = 0
+    start = None
+    for m in _TOKEN_RE.finditer(buf):
+        tok = m.group()
+        if tok == b"{":
+            if depth == 0:
+                start = m.start()
+            depth += 1
+        elif tok == b"}":
+            depth -= 1
+            if depth == 0:
+                spans.append((start, m.end()))
+    return spans
+
+
+def build_offset_index(path):
+    """
+    Scans the data file once and returns its offset index. Each record is
+    decoded a single time here to read its keys; nothing is kept afterwards.
+    """
+    with open(path, "rb") as f:
+        buf = f.read()
+
+    records = []
+    for start, end in scan_record_spans(buf):
+        item = json.loads(buf[start:end])
+        records.append({
+            "id": item.get("id"),
+            "name": item.get("name"),
+            "wiki_link": item.get("wiki_link"),
+            "start": start,
+            "end": end,
+        })
+
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "records": records}
+
+
+def load_offset_index(path, rebuild=False):
+    """
+    Returns the offset index for path, reusing the stored sidecar index
+    unless the data file changed since it was written.
+    """
+    index_path = path + INDEX_SUFFIX
+    st = os.stat(path)
+
+    if not rebuild and os.path.exists(index_path):
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("size") == st.st_size and index.get("mtime_ns") == st.st_mtime_ns:
+                return index
+        except (OSError, ValueError):
+            pass  # unreadable index, rebuild below
+
+    index = build_offset_index(path)
+    try:
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"Warning: could not write index {index_path}: {e}")
+    return index
+
+
+class LazyItemLoader:
+    """
+    Read-only, on-demand access to the records of one data file.
+
+    Records can be looked up by wiki_link, name (case-insensitive) or id.
+    Only requested records are decoded; the most recently used ones are cached.
+    If the data file is rewritten, the index and mapping are reloaded on the
+    next access.
+    """
+
+    def __init__(self, path, cache_size=128):
+        """
+        :param path: JSON or JSONL file produced by the scrapers.
+        :param cache_size: Maximum number of decoded records kept in memory.
+        """
+        self.path = path
+        self.cache_size = cache_size
+        self._mmap = None
+        self._iterators = 0
+        self._open()
+
+    def _open(self):
+        for _ in range(MAX_OPEN_ATTEMPTS):
+            if self._try_open():
+                return
+        raise OSError(f"{self.path} kept changing while it was being indexed")
+
+    def _try_open(self):
+        """Loads the index and maps the file; returns False if the file changed in between."""
+        self._index = load_offset_index(self.path)
+        self._records = self._index["records"]
+
+        self._by_link = {}
+        self._by_name = {}
+        self._by_id = {}
+        for pos, rec in enumerate(self._records):
+            if rec["wiki_link"]:
+                self._by_link[rec["wiki_link"]] = pos
+            if rec["name"]:
+                self._by_name.setdefault(rec["name"].lower(), pos)
+            if rec["id"] is not None:
+                self._by_id[rec["id"]] = pos
+
+        self._cache = OrderedDict()
+        with open(self.path, "rb") as f:
+            # The index must describe the file actually mapped, not the one on disk at index time
+            st = os.fstat(f.fileno())
+            if (st.st_size, st.st_mtime_ns) != (self._index["size"], self._index["mtime_ns"]):
+                return False
+            # mmap cannot map an empty file; the mapping stays valid after f is closed
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self._records else None
+        return True
+
+    def _refresh(self):
+        """
+        Reloads the index and mapping if the data file changed since it was mapped.
+        Slicing a mapping of a file that was truncated in place kills the
+        process with SIGBUS, so this runs before every access.
+        """
+        st = os.stat(self.path)
+        if (st.st_size, st.st_mtime_ns) == (self._index["size"], self._index["mtime_ns"]):
+            return
+        self._drop_mapping()
+        self._open()
+
+    def __len__(self):
+        self._refresh()
+        return len(self._records)
+
+    def __contains__(self, key):
+        self._refresh()
+        return self._position(key) is not None
+
+    def __iter__(self):
+        """
+        Yields every record in file order, decoding lazily (bypasses the cache).
+        The iteration keeps reading the file as it was when it started, even
+        if the loader reloads a rewritten file in the meantime.
+        """
+        self._refresh()
+        records, buf = self._records, self._mmap
+        self._iterators += 1
+        try:
+            for rec in records:
+                yield json.loads(buf[rec["start"]:rec["end"]])
+        finally:
+            self._iterators -= 1
+
+    def names(self):
+        self._refresh()
+        return [rec["name"] for rec in self._records]
+
+    def wiki_links(self):
+        self._refresh()
+        return [rec["wiki_link"] for rec in self._records]
+
+    def _position(self, key):
+        if isinstance(key, int):
+            return self._by_id.get(key)
+        pos = self._by_link.get(key)
+        if pos is None:
+            pos = self._by_name.get(key.lower())
+        return pos
+
+    def _decode(self, pos):
+        rec = self._records[pos]
+        return json.loads(self._mmap[rec["start"]:rec["end"]])
+
+    def get(self, key, default=None):
+        """
+        Returns the record for a wiki_link, name or id, or default if unknown.
+        The returned dict is shared with the cache; copy it before mutating.
+        """
+        self._refresh()
+        pos = self._position(key)
+        if pos is None:
+            return default
+
+        item = self._cache.get(pos)
+        if item is not None:
+            self._cache.move_to_end(pos)
+            return item
+
+        item = self._decode(pos)
+        self._cache[pos] = item
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return item
+
+    def __getitem__(self, key):
+        item = self.get(key)
+        if item is None:
+            raise KeyError(key)
+        return item
+
+    def _drop_mapping(self):
+        # A running iterator may still read the old mapping; dropping our
+        # reference lets it be unmapped once the last iterator lets go of it
+        if self._mmap is not None and not self._iterators:
+            self._mmap.close()
+        self._mmap = None
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_jsonl(items, path):
+    """Writes items as JSONL, one compact record per line (swapped in atomically)."""
+    def write(f):
+        for item in items:
+            f.write(json.dumps(item, ensure_ascii=False))
+            f.write("\n")
+    atomic_write(path, write)
+
+
+def iter_jsonl(path):
+    """Yields records from a JSONL file one at a time."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[2] == "--to-jsonl":
+        with LazyItemLoader(sys.argv[1]) as loader:
+            write_jsonl(loader, sys.argv[3])
+            print(f"Wrote {len(loader)} records to {sys.argv[3]}")
+        sys.exit(0)
+
+    if len(sys.argv) != 3:
+        print("Usage: python lazy_item_loader.py <file.json> <name|wiki_link>")
+        print("       python lazy_item_loader.py <file.json> --to-jsonl <out.jsonl>")
+        sys.exit(1)
+
+    with LazyItemLoader(sys.argv[1]) as loader:
+        item = loader.get(sys.argv[2])
+        if item is None:
+            print(f"❌ No item named {sys.argv[2]!r} in {sys.argv[1]}")
+            sys.exit(1)
+        print(json.dumps(item, indent=2, ensure_ascii=False))
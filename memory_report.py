@@ -0,0 +1,75 @@
+"""
+Per-stage memory reporting with tracemalloc.
+
+    report = MemoryReport()
+    report.start()
+    ...scrape...
+    report.stage("scrape")
+    ...write JSON...
+    report.stage("write")
+    print(report.format())
+
+Each stage records the traced memory still allocated when it ends, the peak
+reached during it, and the source lines that grew the most since the
+previous stage.
+"""
+
+import tracemalloc
+
+# Allocations made by tracemalloc itself or by the import machinery are noise
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _mb(n):
+    return n / (1024 * 1024)
+
+
+class MemoryReport:
+    """
+    Collects one tracemalloc snapshot per stage.
+    """
+
+    def __init__(self, top=5, frames=1):
+        """
+        :param top: Number of top-growing source lines listed per stage.
+        :param frames: Traceback depth stored per allocation (more is slower).
+        """
+        self.top = top
+        self.frames = frames
+        self.stages = []  # (name, current_bytes, peak_bytes, top_stats)
+        self._last = None
+
+    def start(self):
+        tracemalloc.start(self.frames)
+        self._last = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+    def stage(self, name):
+        """Ends the current stage: records current/peak memory and the biggest growth."""
+        if not tracemalloc.is_tracing():
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        growth = snapshot.compare_to(self._last, "lineno")[:self.top]
+        self.stages.append((name, current, peak, growth))
+        self._last = snapshot
+        if hasattr(tracemalloc, "reset_peak"):  # Python 3.9+
+            tracemalloc.reset_peak()
+
+    def stop(self):
+        tracemalloc.stop()
+
+    def format(self):
+        lines = ["", "--- Memory report (tracemalloc) ---"]
+        for name, current, peak, growth in self.stages:
+            lines.append(f"[{name}] current {_mb(current):.1f} MB, peak {_mb(peak):.1f} MB")
+            for stat in growth:
+                if stat.size_diff <= 0:
+                    continue
+                frame = stat.traceback[0]
+                lines.append(f"    +{_mb(stat.size_diff):7.2f} MB  {frame.filename}:{frame.lineno}")
+        return "\n".join(lines)
@@ -0,0 +1,27 @@
+"""
+Post-scrape stages, run by every entry point after it has written a dataset.
+
+Keeps the derived files (search index, aggregate tables) in step with
+all_weapons_data.json / all_armor_data.json.
+"""
+
+import os
+
+from item_aggregates import refresh_aggregates
+from search_index import DATASETS, refresh_search_index
+
+
+def run_post_scrape(kind, items, output_file=None):
+    """
+    :param kind: "weapons" or "armor"
+    :param items: The items just written for that kind (dicts or ItemRecords)
+    :param output_file: Where the items were written. The derived files
+                        describe the default datasets only, so nothing is
+                        refreshed for any other file.
+    """
+    if output_file is not None and os.path.abspath(output_file) != os.path.abspath(DATASETS[kind]):
+        print(f"Skipping search index and aggregates: {output_file} is not {DATASETS[kind]}")
+        return
+    refresh_search_index(kind, items)
+    # Reads both datasets from disk, so call after the JSON has been saved
+    refresh_aggregates()
@@ -0,0 +1,181 @@
+"""
+Structural diff between two scrape generations.
+
+Items are keyed by wiki_link. Every section of an item (stats, locations,
+vocations, resistances, ...) gets its own hash, plus one hash for the whole
+item, so unchanged items are skipped with a single comparison and changed
+items are only inspected section by section.
+
+Usage:
+    python scrape_diff.py old/all_armor_data.json all_armor_data.json
+    python scrape_diff.py old.json new.json --json > changes.json
+
+Exit code is 0 when nothing changed and 1 when there are changes (like diff).
+"""
+
+import hashlib
+import json
+import sys
+
+# Sections compared per item; id is left out because it only reflects list position
+SECTIONS = (
+    "name", "description", "image_path", "locations", "stats",
+    "elemental_res", "debilitation_res", "vocations",
+)
+
+
+def _as_dict(item):
+    # Accept ItemRecord objects as well as plain JSON dicts
+    return item.to_dict() if hasattr(item, "to_dict") else item
+
+
+def _hash(value):
+    # sort_keys: reordered stats/resistance keys are not a change
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()
+
+
+def section_hashes(item):
+    """
+    Returns (item_hash, {section: hash}) for one item.
+    Missing sections (e.g. resistances on weapons) hash like null.
+    """
+    item = _as_dict(item)
+    sections = {section: _hash(item.get(section)) for section in SECTIONS}
+    item_hash = hashlib.sha1("".join(sections[s] for s in SECTIONS).encode("ascii")).hexdigest()
+    return item_hash, sections
+
+
+def build_hash_index(items):
+    """
+    Hashes a whole generation: {wiki_link: (item_hash, section_hashes)}.
+    Keep this around to diff the next run without re-hashing the old one.
+    """
+    index = {}
+    for item in items:
+        item = _as_dict(item)
+        index[item["wiki_link"]] = section_hashes(item)
+    return index
+
+
+def _diff_section(old, new):
+    """Describes how one section changed, in a compact form."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        change = {}
+        added = {k: new[k] for k in new if k not in old}
+        removed = {k: old[k] for k in old if k not in new}
+        changed = {k: [old[k], new[k]] for k in new if k in old and old[k] != new[k]}
+        if added:
+            change["added"] = added
+        if removed:
+            change["removed"] = removed
+        if changed:
+            change["changed"] = changed
+        return change
+
+    if isinstance(old, list) and isinstance(new, list):
+        change = {}
+        added = [v for v in new if v not in old]
+        removed = [v for v in old if v not in new]
+        if added:
+            change["added"] = added
+        if removed:
+            change["removed"] = removed
+        if not change:
+            change["reordered"] = new
+        return change
+
+    return {"old": old, "new": new}
+
+
+def diff_items(old_items, new_items, old_index=None):
+    """
+    Compares two generations of items.
+
+    :param old_items: Items of the previous run (dicts or ItemRecords).
+    :param new_items: Items of the current run.
+    :param old_index: Optional precomputed build_hash_index(old_items).
+    :return: List of change dicts, each with "op" ("added", "removed" or
+             "changed"), "wiki_link" and "name"; changed entries also carry
+             "sections" mapping section name to a compact description.
+    """
+    old_by_link = {}
+    for item in old_items:
+        item = _as_dict(item)
+        old_by_link[item["wiki_link"]] = item
+    if old_index is None:
+        old_index = build_hash_index(old_by_link.values())
+
+    changes = []
+    seen = set()
+    for item in new_items:
+        item = _as_dict(item)
+        link = item["wiki_link"]
+        seen.add(link)
+
+        if link not in old_index:
+            changes.append({"op": "added", "wiki_link": link, "name": item.get("name")})
+            continue
+
+        old_item_hash, old_sections = old_index[link]
+        new_item_hash, new_sections = section_hashes(item)
+        if new_item_hash == old_item_hash:
+            continue
+
+        old_item = old_by_link[link]
+        sections = {}
+        for section in SECTIONS:
+            if new_sections[section] != old_sections[section]:
+                sections[section] = _diff_section(old_item.get(section), item.get(section))
+        changes.append({"op": "changed", "wiki_link": link, "name": item.get("name"), "sections": sections})
+
+    for link, old_item in old_by_link.items():
+        if link not in seen:
+            changes.append({"op": "removed", "wiki_link": link, "name": old_item.get("name")})
+
+    return changes
+
+
+def changed_links(changes):
+    """Returns the wiki_links touched by a change list (for cache invalidation)."""
+    return {change["wiki_link"] for change in changes}
+
+
+def format_changes(changes):
+    """Renders a change list as a short human-readable log."""
+    lines = []
+    for change in changes:
+        if change["op"] == "added":
+            lines.append(f"+ {change['name']} ({change['wiki_link']})")
+        elif change["op"] == "removed":
+            lines.append(f"- {change['name']} ({change['wiki_link']})")
+        else:
+            lines.append(f"~ {change['name']}: {', '.join(change['sections'])}")
+            for section, detail in change["sections"].items():
+                lines.append(f"    {section}: {json.dumps(detail, ensure_ascii=False)}")
+    return "\n".join(lines)
+
+
+def load_items(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if a != "--json"]
+    if len(args) != 2:
+        print("Usage: python scrape_diff.py <old.json> <new.json> [--json]")
+        sys.exit(2)
+
+    changes = diff_items(load_items(args[0]), load_items(args[1]))
+
+    if "--json" in sys.argv:
+        print(json.dumps(changes, indent=2, ensure_ascii=False))
+    elif changes:
+        print(format_changes(changes))
+        counts = {op: sum(1 for c in changes if c["op"] == op) for op in ("added", "removed", "changed")}
+        print(f"\n{counts['added']} added, {counts['removed']} removed, {counts['changed']} changed")
+    else:
+        print("No changes.")
+
+    sys.exit(1 if changes else 0)
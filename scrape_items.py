@@ -0,0 +1,187 @@
+"""
+Batch CLI for targeted scrapes.
+
+Scrapes all items of one kind, a named subset, or URLs listed in a file,
+and merges the results into the existing JSON output by wiki_link.
+
+Examples:
+    python scrape_items.py weapons --item "Iron Sword" --item "Dragon's Bite"
+    python scrape_items.py armor --urls-file urls.txt --fields elemental_res debilitation_res --no-images
+    python scrape_items.py armor --no-images --memory-report
+"""
+
+import argparse
+import json
+import os
+import sys
+from urllib.parse import quote_plus
+
+from FextralifeWeaponScraper import FextralifeWeaponsListScraper, crawl_weapons
+from FextralifeWeaponScraper import FextralifeWeaponScraper as FextralifeWeaponPageScraper
+from FextralifeArmorListScraper import FextralifeArmorListScraper, crawl_armor
+from FextralifeArmorListScraper import FextralifeWeaponScraper as FextralifeArmorPageScraper
+from FextralifeItemModel import save_json
+from memory_report import MemoryReport
+from post_scrape import run_post_scrape
+
+BASE_URL = "https://dragonsdogma.wiki.fextralife.com"
+
+KINDS = {
+    "weapons": {"download_dir": "scraped_weapon_data", "output_file": "all_weapons_data.json"},
+    "armor": {"download_dir": "scraped_armor_images", "output_file": "all_armor_data.json"},
+}
+
+# Fields a scrape can be limited to (wiki_link is the merge key, id is assigned on merge)
+FIELDS = (
+    "name", "description", "image_path", "locations", "stats",
+    "elemental_res", "debilitation_res", "vocations",
+)
+
+
+def load_items(path):
+    """Loads a JSON item list, returning [] if the file does not exist yet."""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def item_url(name, existing_items):
+    """
+    Resolves an item name to its wiki page URL. Known items reuse their stored
+    wiki_link (the wiki is inconsistent about quoting apostrophes); unknown ones
+    get the URL the wiki uses for new pages.
+    """
+    for item in existing_items:
+        if item.get("name", "").lower() == name.lower():
+            return item["wiki_link"]
+    return f"{BASE_URL}/{quote_plus(name)}"
+
+
+def read_urls_file(path):
+    """Reads one URL per line, skipping blank lines and # comments."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def merge_items(existing_items, scraped_items, fields=None):
+    """
+    Merges scraped ItemRecords into existing_items (dicts, in place) by wiki_link.
+    Existing items keep their id and only the given fields are replaced
+    (all fields if fields is None). New items get the next free id.
+
+    :return: A tuple (updated_count, added_count)
+    """
+    by_link = {item["wiki_link"]: item for item in existing_items}
+    next_id = max((item.get("id", 0) for item in existing_items), default=0) + 1
+    updated = added = 0
+
+    for record in scraped_items:
+        scraped = record.to_dict()
+        existing = by_link.get(scraped["wiki_link"])
+        if existing is None:
+            new_item = {k: v for k, v in scraped.items() if k != "id"}
+            new_item["id"] = next_id
+            next_id += 1
+            existing_items.append(new_item)
+            by_link[new_item["wiki_link"]] = new_item
+            added += 1
+            continue
+
+        # Armor slots come from the list page, which a targeted scrape never sees
+        slot = existing.get("stats", {}).get("Armor Type")
+        for key in fields or FIELDS:
+            if key in scraped:
+                existing[key] = scraped[key]
+        if slot and "Armor Type" not in existing.get("stats", {}):
+            existing["stats"]["Armor Type"] = slot
+        updated += 1
+
+    return updated, added
+
+
+def scrape(kind, urls=None, download_images=True):
+    """
+    Scrapes the given item URLs of one kind, or every item of that kind if urls is None.
+    :return: List of ItemRecord objects
+    """
+    download_dir = KINDS[kind]["download_dir"]
+    if kind == "weapons":
+        scraper = FextralifeWeaponPageScraper(download_dir=download_dir, download_images=download_images)
+        if urls is None:
+            return crawl_weapons(FextralifeWeaponsListScraper(), scraper)
+    else:
+        scraper = FextralifeArmorPageScraper(download_dir=download_dir, download_images=download_images)
+        if urls is None:
+            return crawl_armor(FextralifeArmorListScraper(), scraper)
+
+    items = []
+    for i, url in enumerate(urls, 1):
+        print(f"[{i}/{len(urls)}] Parsing {url}")
+        data = scraper.parse_weapon(url)
+        if data:
+            items.append(data)
+    return items
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Scrape selected Fextralife items and merge them into the JSON output.")
+    parser.add_argument("kind", choices=sorted(KINDS))
+    parser.add_argument("--item", action="append", default=[], metavar="NAME",
+                        help="item name to scrape (repeatable)")
+    parser.add_argument("--urls-file", help="file with one item page URL per line")
+    parser.add_argument("--fields", nargs="+", choices=FIELDS,
+                        help="only update these fields of existing items")
+    parser.add_argument("--no-images", action="store_true", help="do not download images")
+    parser.add_argument("--output", help="JSON file to merge into (defaults to the kind's output file)")
+    parser.add_argument("--memory-report", action="store_true",
+                        help="print tracemalloc current/peak memory per stage")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    report = MemoryReport()
+    if args.memory_report:
+        report.start()
+
+    output_file = args.output or KINDS[args.kind]["output_file"]
+    existing_items = load_items(output_file)
+
+    urls = None
+    if args.item or args.urls_file:
+        urls = [item_url(name, existing_items) for name in args.item]
+        if args.urls_file:
+            urls.extend(read_urls_file(args.urls_file))
+
+    # Images are only worth fetching if image_path is going to be written
+    fields = args.fields
+    download_images = not args.no_images and (fields is None or "image_path" in fields)
+    if fields is None and not download_images:
+        fields = [f for f in FIELDS if f != "image_path"]
+
+    report.stage("load")
+
+    scraped_items = scrape(args.kind, urls, download_images=download_images)
+    report.stage("scrape")
+    if not scraped_items:
+        print("Nothing scraped, output left unchanged")
+        return 1
+
+    updated, added = merge_items(existing_items, scraped_items, fields)
+    report.stage("merge")
+    save_json(existing_items, output_file)
+    report.stage("write")
+
+    print(f"\nUpdated {updated} and added {added} {args.kind} in {output_file}")
+    run_post_scrape(args.kind, existing_items, output_file)
+    report.stage("post_scrape")
+
+    if args.memory_report:
+        print(report.format())
+        report.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
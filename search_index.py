@@ -0,0 +1,267 @@
+"""
+Full-text search over item names, descriptions and locations.
+
+An inverted index (token -> items) with prefix and trigram lookups is built
+from both datasets and saved to search_index.json. Queries are answered from
+in-memory postings:
+
+    - exact token matches score highest (tf-idf, names weigh more)
+    - otherwise a query term expands to indexed tokens it is a prefix of
+    - otherwise to tokens with similar trigrams (typos)
+
+The saved file only stores the per-item term weights; postings, the prefix
+table and the trigram table are rebuilt on load. Updates are incremental:
+only items whose searchable text changed are re-indexed.
+
+Usage:
+    python search_index.py build
+    python search_index.py query "black cat mountebank"
+    python search_index.py query "Ur-Dragon reward" -n 5
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+from collections import defaultdict
+
+from scrape_diff import section_hashes
+
+INDEX_FILE = "search_index.json"
+
+DATASETS = {"weapons": "all_weapons_data.json", "armor": "all_armor_data.json"}
+
+# Field weights: a hit in the name counts more than one in a long location line
+FIELD_WEIGHTS = {"name": 3.0, "description": 1.0, "locations": 1.0}
+
+MIN_PREFIX = 2
+PREFIX_FACTOR = 0.5
+TRIGRAM_FACTOR = 0.3
+TRIGRAM_MIN_SIMILARITY = 0.5
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Lowercases, drops apostrophes ("Mountebank's" -> "mountebanks") and splits on anything else."""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower().replace("'", "").replace("’", ""))
+
+
+def trigrams(token):
+    padded = f"^{token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _item_terms(item):
+    """Weighted term frequencies for one item's searchable fields."""
+    terms = defaultdict(float)
+    for field, weight in FIELD_WEIGHTS.items():
+        value = item.get(field)
+        texts = value if isinstance(value, list) else [value]
+        for text in texts:
+            for token in tokenize(text):
+                terms[token] += weight
+    return dict(terms)
+
+
+def _search_hash(item):
+    # Reuse the scrape_diff section hashes; only searchable sections matter here
+    _, sections = section_hashes(item)
+    return "".join(sections[field] for field in FIELD_WEIGHTS)
+
+
+class SearchIndex:
+    """
+    Inverted index over weapons and armor, keyed by wiki_link.
+    """
+
+    def __init__(self):
+        self.docs = {}  # wiki_link -> {"kind", "name", "id", "hash", "terms"}
+        self._postings = defaultdict(dict)  # token -> {wiki_link: weight}
+        self._prefixes = defaultdict(set)   # prefix -> tokens
+        self._trigrams = defaultdict(set)   # trigram -> tokens
+
+    # ---------------------------
+    # Building / updating
+    # ---------------------------
+
+    def _add_token(self, token):
+        for i in range(MIN_PREFIX, len(token)):
+            self._prefixes[token[:i]].add(token)
+        for gram in trigrams(token):
+            self._trigrams[gram].add(token)
+
+    def _drop_token(self, token):
+        for i in range(MIN_PREFIX, len(token)):
+            self._prefixes[token[:i]].discard(token)
+        for gram in trigrams(token):
+            self._trigrams[gram].discard(token)
+
+    def _index_doc(self, link, doc):
+        self.docs[link] = doc
+        for token, weight in doc["terms"].items():
+            if not self._postings[token]:
+                self._add_token(token)
+            self._postings[token][link] = weight
+
+    def remove(self, link):
+        doc = self.docs.pop(link, None)
+        if doc is None:
+            return
+        for token in doc["terms"]:
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(link, None)
+            if not postings:
+                del self._postings[token]
+                self._drop_token(token)
+
+    def update_kind(self, kind, items):
+        """
+        Brings the index in line with the current items of one kind.
+        Unchanged items are skipped; items no longer present are removed.
+
+        :return: A tuple (reindexed_count, removed_count)
+        """
+        reindexed = 0
+        current = set()
+        for item in items:
+            item = item.to_dict() if hasattr(item, "to_dict") else item
+            link = item["wiki_link"]
+            current.add(link)
+
+            doc_hash = _search_hash(item)
+            old = self.docs.get(link)
+            if old is not None and old["hash"] == doc_hash and old["id"] == item.get("id"):
+                continue
+
+            self.remove(link)
+            self._index_doc(link, {
+                "kind": kind,
+                "name": item.get("name"),
+                "id": item.get("id"),
+                "hash": doc_hash,
+                "terms": _item_terms(item),
+            })
+            reindexed += 1
+
+        stale = [link for link, doc in self.docs.items() if doc["kind"] == kind and link not in current]
+        for link in stale:
+            self.remove(link)
+        return reindexed, len(stale)
+
+    # ---------------------------
+    # Querying
+    # ---------------------------
+
+    def _expand(self, term):
+        """Returns [(token, factor)] an indexed vocabulary match for one query term."""
+        if term in self._postings:
+            return [(term, 1.0)]
+
+        prefixed = self._prefixes.get(term)
+        if prefixed:
+            return [(token, PREFIX_FACTOR) for token in prefixed]
+
+        grams = trigrams(term)
+        candidates = defaultdict(int)
+        for gram in grams:
+            for token in self._trigrams.get(gram, ()):
+                candidates[token] += 1
+        matches = []
+        for token, shared in candidates.items():
+            similarity = shared / len(grams | trigrams(token))
+            if similarity >= TRIGRAM_MIN_SIMILARITY:
+                matches.append((token, TRIGRAM_FACTOR * similarity))
+        return matches
+
+    def search(self, query, limit=10, kind=None):
+        """
+        Ranks items for a free-text query.
+
+        :param kind: Optional "weapons" or "armor" to restrict results.
+        :return: List of (score, wiki_link, doc) tuples, best first.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        n_docs = len(self.docs) or 1
+        scores = defaultdict(float)
+        matched = defaultdict(int)
+        for term in terms:
+            hit_docs = set()
+            for token, factor in self._expand(term):
+                postings = self._postings[token]
+                idf = math.log(1 + n_docs / len(postings))
+                for link, weight in postings.items():
+                    scores[link] += factor * idf * (1 + math.log(weight))
+                    hit_docs.add(link)
+            for link in hit_docs:
+                matched[link] += 1
+
+        results = []
+        for link, score in scores.items():
+            doc = self.docs[link]
+            if kind and doc["kind"] != kind:
+                continue
+            # Items matching every query term rank above partial matches
+            results.append((score * matched[link] / len(terms), link, doc))
+        results.sort(key=lambda r: (-r[0], r[2]["name"] or ""))
+        return results[:limit]
+
+    # ---------------------------
+    # Persistence
+    # ---------------------------
+
+    def save(self, path=INDEX_FILE):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"docs": self.docs}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path=INDEX_FILE):
+        """Loads a saved index, or returns an empty one if path does not exist."""
+        index = cls()
+        if not os.path.exists(path):
+            return index
+        with open(path, "r", encoding="utf-8") as f:
+            docs = json.load(f)["docs"]
+        for link, doc in docs.items():
+            index._index_doc(link, doc)
+        return index
+
+
+def refresh_search_index(kind, items, path=INDEX_FILE):
+    """Incrementally updates the saved index after a scrape of one kind."""
+    index = SearchIndex.load(path)
+    reindexed, removed = index.update_kind(kind, items)
+    index.save(path)
+    print(f"Search index: {reindexed} {kind} re-indexed, {removed} removed ({path})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or query the item search index.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="(re)index both datasets incrementally")
+    q = sub.add_parser("query", help="search the index")
+    q.add_argument("text")
+    q.add_argument("-n", type=int, default=10, help="number of results (default: 10)")
+    q.add_argument("--kind", choices=sorted(DATASETS))
+    parser.add_argument("--index", default=INDEX_FILE, help=f"index file (default: {INDEX_FILE})")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        for kind, data_file in DATASETS.items():
+            with open(data_file, "r", encoding="utf-8") as f:
+                refresh_search_index(kind, json.load(f), args.index)
+    else:
+        index = SearchIndex.load(args.index)
+        results = index.search(args.text, limit=args.n, kind=args.kind)
+        if not results:
+            print("No matches.")
+        for score, link, doc in results:
+            print(f"{score:7.2f}  [{doc['kind']}] {doc['name']}  {link}")
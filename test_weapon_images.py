@@ -0,0 +1,54 @@
+"""
+Image fallbacks of the weapon parser: infobox first, then an image named
+after the weapon, then the first large image.
+
+Run with: python -m unittest test_weapon_images
+"""
+
+import tempfile
+import unittest
+
+from FextralifeWeaponScraper import FextralifeWeaponScraper
+
+PAGE = """<html><head><title>{name} | Dragons Dogma Wiki</title></head><body>
+{infobox}
+<h2>Where to find {name}</h2>
+<p>One.</p><p>Two.</p><p>{name} description.</p>
+{images}
+</body></html>"""
+
+
+def page(name, *images, infobox=""):
+    return PAGE.format(name=name, infobox=infobox, images="".join(f'<img src="/file/{i}">' for i in images))
+
+
+class WeaponImageTest(unittest.TestCase):
+
+    def setUp(self):
+        download_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(download_dir.cleanup)
+        self.scraper = FextralifeWeaponScraper(download_dir.name, download_images=False)
+
+    def image_urls(self, html):
+        _, image_urls = self.scraper.extract_weapon(html, "https://example.test/item")
+        return image_urls
+
+    def test_infobox_image_first(self):
+        infobox = '<div id="infobox"><img data-src="/file/infobox.png" src="/file/blank.gif"></div>'
+        html = page("Iron Sword", "iron_sword.png", infobox=infobox)
+        self.assertEqual(self.image_urls(html), [self.scraper.BASE_URL + "/file/infobox.png"])
+
+    def test_name_match_before_largest(self):
+        html = page("Iron Sword", "banner.png", "iron_sword.png")
+        self.assertEqual(self.image_urls(html), [self.scraper.BASE_URL + "/file/iron_sword.png"])
+
+    def test_largest_skips_icons(self):
+        html = page("Blade", "icon_fire.png", "banner.png")
+        self.assertEqual(self.image_urls(html), [self.scraper.BASE_URL + "/file/banner.png"])
+
+    def test_no_image(self):
+        self.assertEqual(self.image_urls(page("Blade", "icon_fire.png")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()